@@ -1,241 +1,434 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify
+from werkzeug.exceptions import BadRequest, RequestEntityTooLarge
+import hashlib
 import json
-import re
-from typing import Dict, List, Tuple
+import os
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+
+from optimizers.cache import LRUCache
+from optimizers.encoding import ResponseEncoder
+from optimizers.incremental import AnalysisSessions, PromptTooLarge, parse_edits
+from optimizers.lazy import lazy
+from optimizers.metrics import Metrics
+from optimizers.prompt_optimizer import PromptOptimizer
+from optimizers.registry import ToolRegistry
+from optimizers.results import AnalysisResult, OptimizationResult
+from optimizers.rules import RuleBudget
+from optimizers.singleflight import SingleFlight
+from optimizers.templates import TemplateEngine
+
+if TYPE_CHECKING:
+    # Imported on first use: the quality scorer pulls in NumPy, which no cold start needs
+    from optimizers.advanced_optimizer import AdvancedPromptOptimizer
+    from optimizers.pipeline import OptimizationPipeline
 
 app = Flask(__name__)
 
-class PromptOptimizer:
-    def __init__(self):
-        self.tools = {
-            'copilot': {
-                'name': 'GitHub Copilot',
-                'strengths': ['code completion', 'context awareness', 'multi-language support'],
-                'preferences': ['clear function signatures', 'descriptive variable names', 'inline comments'],
-                'optimization_strategies': [
-                    'Add specific type hints and function signatures',
-                    'Include clear variable names and context',
-                    'Break complex requests into smaller, focused tasks',
-                    'Use descriptive comments to guide code generation'
-                ]
-            },
-            'cursor': {
-                'name': 'Cursor AI',
-                'strengths': ['code editing', 'refactoring', 'debugging'],
-                'preferences': ['specific edit instructions', 'clear before/after examples', 'focused scope'],
-                'optimization_strategies': [
-                    'Specify exact locations for code changes',
-                    'Provide clear before/after examples',
-                    'Use precise action verbs (refactor, optimize, fix)',
-                    'Include relevant file context and imports'
-                ]
-            },
-            'replit': {
-                'name': 'Replit AI',
-                'strengths': ['rapid prototyping', 'educational code', 'web development'],
-                'preferences': ['step-by-step instructions', 'beginner-friendly explanations', 'complete examples'],
-                'optimization_strategies': [
-                    'Break down complex tasks into learning steps',
-                    'Request complete, runnable examples',
-                    'Ask for explanations alongside code',
-                    'Specify the target skill level (beginner/intermediate/advanced)'
-                ]
-            },
-            'codewhisperer': {
-                'name': 'Amazon CodeWhisperer',
-                'strengths': ['AWS integration', 'security best practices', 'enterprise patterns'],
-                'preferences': ['AWS service context', 'security considerations', 'scalable patterns'],
-                'optimization_strategies': [
-                    'Mention relevant AWS services and integrations',
-                    'Include security and compliance requirements',
-                    'Request scalable and maintainable solutions',
-                    'Specify deployment and infrastructure context'
-                ]
-            },
-            'tabnine': {
-                'name': 'Tabnine',
-                'strengths': ['local context', 'team patterns', 'code consistency'],
-                'preferences': ['consistent coding style', 'team conventions', 'local codebase patterns'],
-                'optimization_strategies': [
-                    'Reference existing code patterns in your project',
-                    'Mention team coding standards and conventions',
-                    'Request consistency with existing codebase style',
-                    'Include relevant file and class context'
-                ]
-            },
-            'codium': {
-                'name': 'Codium AI',
-                'strengths': ['test generation', 'code analysis', 'quality assurance'],
-                'preferences': ['test scenarios', 'edge cases', 'code quality metrics'],
-                'optimization_strategies': [
-                    'Request comprehensive test coverage',
-                    'Specify edge cases and error scenarios',
-                    'Ask for code quality improvements',
-                    'Include performance and maintainability considerations'
-                ]
-            }
-        }
-    
-    def analyze_prompt(self, prompt: str) -> Dict:
-        """Analyze the input prompt to understand intent and complexity."""
-        analysis = {
-            'intent': self._detect_intent(prompt),
-            'complexity': self._assess_complexity(prompt),
-            'language': self._detect_language(prompt),
-            'keywords': self._extract_keywords(prompt),
-            'length': len(prompt.split())
-        }
-        return analysis
-    
-    def _detect_intent(self, prompt: str) -> str:
-        """Detect the primary intent of the prompt."""
-        prompt_lower = prompt.lower()
-        
-        if any(word in prompt_lower for word in ['create', 'build', 'implement', 'develop']):
-            return 'creation'
-        elif any(word in prompt_lower for word in ['fix', 'debug', 'error', 'bug']):
-            return 'debugging'
-        elif any(word in prompt_lower for word in ['refactor', 'improve', 'optimize', 'clean']):
-            return 'refactoring'
-        elif any(word in prompt_lower for word in ['test', 'unit test', 'testing']):
-            return 'testing'
-        elif any(word in prompt_lower for word in ['explain', 'understand', 'how', 'what']):
-            return 'explanation'
-        else:
-            return 'general'
-    
-    def _assess_complexity(self, prompt: str) -> str:
-        """Assess the complexity level of the prompt."""
-        word_count = len(prompt.split())
-        technical_terms = len(re.findall(r'\b(?:class|function|method|algorithm|database|API|framework|library)\b', prompt.lower()))
-        
-        if word_count < 10 and technical_terms < 2:
-            return 'simple'
-        elif word_count < 30 and technical_terms < 5:
-            return 'moderate'
-        else:
-            return 'complex'
-    
-    def _detect_language(self, prompt: str) -> str:
-        """Detect programming language mentioned in the prompt."""
-        languages = ['python', 'javascript', 'java', 'c++', 'c#', 'go', 'rust', 'typescript', 'php', 'ruby']
-        prompt_lower = prompt.lower()
-        
-        for lang in languages:
-            if lang in prompt_lower:
-                return lang
-        return 'general'
-    
-    def _extract_keywords(self, prompt: str) -> List[str]:
-        """Extract important keywords from the prompt."""
-        # Simple keyword extraction - in a real implementation, you might use NLP libraries
-        words = re.findall(r'\b\w+\b', prompt.lower())
-        technical_keywords = [word for word in words if len(word) > 3 and 
-                            word in ['function', 'class', 'method', 'variable', 'algorithm', 'database', 
-                                   'api', 'framework', 'library', 'server', 'client', 'frontend', 'backend']]
-        return list(set(technical_keywords))
-    
-    def optimize_for_tool(self, prompt: str, tool_id: str) -> Tuple[str, List[str]]:
-        """Optimize the prompt for a specific tool."""
-        if tool_id not in self.tools:
-            return prompt, ["Tool not found"]
-        
-        tool = self.tools[tool_id]
-        analysis = self.analyze_prompt(prompt)
-        
-        optimized_prompt = self._apply_optimizations(prompt, tool, analysis)
-        explanations = self._generate_explanations(prompt, optimized_prompt, tool, analysis)
-        
-        return optimized_prompt, explanations
-    
-    def _apply_optimizations(self, prompt: str, tool: Dict, analysis: Dict) -> str:
-        """Apply tool-specific optimizations to the prompt."""
-        optimized = prompt
-        
-        # Add context based on tool strengths
-        if tool['name'] == 'GitHub Copilot':
-            if analysis['intent'] == 'creation' and analysis['language'] != 'general':
-                optimized = f"In {analysis['language']}, {optimized}"
-            if 'function' in analysis['keywords']:
-                optimized += "\n\nPlease include type hints and clear parameter names."
-        
-        elif tool['name'] == 'Cursor AI':
-            if analysis['intent'] == 'refactoring':
-                optimized = f"Please refactor the following code: {optimized}\n\nProvide the complete updated code with clear explanations of changes made."
-            elif analysis['intent'] == 'debugging':
-                optimized = f"Debug this code issue: {optimized}\n\nPlease identify the problem and provide the corrected code."
-        
-        elif tool['name'] == 'Replit AI':
-            if analysis['complexity'] == 'complex':
-                optimized = f"Break this down step by step: {optimized}\n\nPlease provide a complete, runnable example with explanations."
-            optimized += "\n\nMake sure the code is beginner-friendly and well-commented."
-        
-        elif tool['name'] == 'Amazon CodeWhisperer':
-            if 'api' in analysis['keywords'] or 'server' in analysis['keywords']:
-                optimized += "\n\nPlease consider AWS best practices and security implications."
-            if analysis['intent'] == 'creation':
-                optimized += "\n\nInclude error handling and scalability considerations."
-        
-        elif tool['name'] == 'Tabnine':
-            optimized = f"Following our team's coding standards: {optimized}\n\nPlease maintain consistency with existing codebase patterns."
-        
-        elif tool['name'] == 'Codium AI':
-            if analysis['intent'] != 'testing':
-                optimized += "\n\nAlso generate comprehensive unit tests for this code."
-            optimized += "\n\nInclude edge cases and error scenarios in the tests."
-        
-        return optimized
-    
-    def _generate_explanations(self, original: str, optimized: str, tool: Dict, analysis: Dict) -> List[str]:
-        """Generate explanations for the optimizations made."""
-        explanations = []
-        
-        if len(optimized) > len(original):
-            explanations.append(f"Added context and specifications optimized for {tool['name']}'s strengths")
-        
-        if analysis['language'] != 'general':
-            explanations.append(f"Specified programming language ({analysis['language']}) for better context")
-        
-        if analysis['intent'] == 'creation':
-            explanations.append("Enhanced prompt for code creation with specific requirements")
-        elif analysis['intent'] == 'debugging':
-            explanations.append("Structured prompt for effective debugging assistance")
-        elif analysis['intent'] == 'refactoring':
-            explanations.append("Optimized for code improvement and refactoring guidance")
-        
-        explanations.extend([f"Leveraged {tool['name']}'s strength in {strength}" for strength in tool['strengths'][:2]])
-        
-        return explanations
+# Upper bound on prompts x tools handled by a single batch request
+MAX_BATCH_ITEMS = 1000
+
+# Request size limits: bytes per request body and characters per prompt
+MAX_BODY_BYTES = int(os.environ.get('OPTIMIZER_MAX_BODY_BYTES', str(1024 * 1024)))
+MAX_PROMPT_CHARS = int(os.environ.get('OPTIMIZER_MAX_PROMPT_CHARS', '100000'))
+app.config['MAX_CONTENT_LENGTH'] = MAX_BODY_BYTES
 
-optimizer = PromptOptimizer()
+# Per-request limits for the advanced rewrite rules: rules are skipped on text
+# longer than RULE_MAX_CHARS, or once RULE_TIME_LIMIT seconds have passed
+RULE_MAX_CHARS = int(os.environ.get('OPTIMIZER_RULE_MAX_CHARS', '20000'))
+RULE_TIME_LIMIT = float(os.environ.get('OPTIMIZER_RULE_TIME_LIMIT', '0.05'))
+
+# Result cache sizing; a size of 0 disables caching, TTL is in seconds
+CACHE_SIZE = int(os.environ.get('OPTIMIZER_CACHE_SIZE', '1024'))
+CACHE_TTL = float(os.environ['OPTIMIZER_CACHE_TTL']) if os.environ.get('OPTIMIZER_CACHE_TTL') else None
+
+# Optional SQLite file holding results shared by all worker processes; replaces
+# the in-process cache when set, bounded by the total size of stored results
+DISK_CACHE_PATH = os.environ.get('OPTIMIZER_DISK_CACHE')
+DISK_CACHE_MAX_BYTES = int(os.environ.get('OPTIMIZER_DISK_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+
+# Identical optimize requests in progress at the same time share one computation.
+# Shorter prompts are cheaper to optimize again than to wait for another thread
+COALESCE_REQUESTS = os.environ.get('OPTIMIZER_COALESCE', '1').lower() not in ('0', 'false', 'no', 'off')
+COALESCE_MIN_CHARS = int(os.environ.get('OPTIMIZER_COALESCE_MIN_CHARS', '2000'))
+
+# Live incremental analysis sessions kept at once, and their idle timeout in seconds
+MAX_ANALYSIS_SESSIONS = 1024
+ANALYSIS_SESSION_TTL = 3600
+
+# Per-stage timing histograms and request counters served on /metrics
+METRICS_ENABLED = os.environ.get('OPTIMIZER_METRICS', '').lower() in ('1', 'true', 'yes', 'on')
+
+metrics = Metrics(enabled=METRICS_ENABLED)
+
+# Service objects are built on first use, not at import, to keep cold starts short
+@lazy
+def get_optimizer() -> PromptOptimizer:
+    optimizer = PromptOptimizer(metrics=metrics)
+    if DISK_CACHE_PATH:
+        # sqlite3 is only imported when configured
+        import sqlite3
+        from optimizers.diskcache import DiskCache
+        try:
+            optimizer.cache = DiskCache(DISK_CACHE_PATH, DISK_CACHE_MAX_BYTES, fingerprint=optimizer.profile_version)
+        except sqlite3.Error as e:
+            # A cache file that cannot be opened must not fail requests
+            app.logger.warning('Disk cache %s unavailable, using the in-process cache: %s', DISK_CACHE_PATH, e)
+    if optimizer.cache is None and CACHE_SIZE > 0:
+        optimizer.cache = LRUCache(CACHE_SIZE, CACHE_TTL)
+    return optimizer
+
+@lazy
+def get_advanced_optimizer() -> 'AdvancedPromptOptimizer':
+    from optimizers.advanced_optimizer import AdvancedPromptOptimizer
+    return AdvancedPromptOptimizer(cache=LRUCache(CACHE_SIZE, CACHE_TTL) if CACHE_SIZE > 0 else None)
+
+@lazy
+def get_pipeline() -> 'OptimizationPipeline':
+    from optimizers.pipeline import OptimizationPipeline
+    return OptimizationPipeline(get_optimizer(), get_advanced_optimizer())
+
+@lazy
+def get_request_coalescer() -> Optional[SingleFlight]:
+    return SingleFlight() if COALESCE_REQUESTS else None
+
+@lazy
+def get_tool_registry() -> ToolRegistry:
+    return ToolRegistry.load()
+
+@lazy
+def get_template_engine() -> TemplateEngine:
+    return TemplateEngine(get_tool_registry())
+
+@lazy
+def get_response_encoder() -> ResponseEncoder:
+    optimizer = get_optimizer()
+    encoder = ResponseEncoder()
+    encoder.preload(tool['name'] for tool in optimizer.tools.values())
+    encoder.preload(optimizer.explanation_strings())
+    return encoder
+
+@lazy
+def get_analysis_sessions() -> AnalysisSessions:
+    return AnalysisSessions(get_optimizer().scanner, MAX_ANALYSIS_SESSIONS, ANALYSIS_SESSION_TTL,
+                            max_length=MAX_PROMPT_CHARS)
+
+def _build_tools_body(tools: Dict, registry: ToolRegistry) -> Tuple[bytes, str]:
+    """Serialize the /api/tools payload once, with tool profile details merged in."""
+    payload = {}
+    for tool_id, tool in tools.items():
+        payload[tool_id] = dict(tool)
+        profile = registry.get(tool_id)
+        if profile is not None:
+            details = profile.to_dict()
+            for field in ('description', 'weaknesses', 'best_practices', 'optimization_techniques', 'prompt_patterns'):
+                payload[tool_id][field] = details[field]
+    body = json.dumps(payload, sort_keys=True).encode('utf-8')
+    return body, hashlib.sha256(body).hexdigest()
+
+@lazy
+def get_tools_body() -> Tuple[bytes, str]:
+    """The /api/tools body and its ETag."""
+    return _build_tools_body(get_optimizer().tools, get_tool_registry())
+
+# The module attributes these getters replaced, for code importing them from app
+_LAZY_ATTRIBUTES = {
+    'optimizer': get_optimizer,
+    'optimize_cache': lambda: get_optimizer().cache,
+    'advanced_optimizer': get_advanced_optimizer,
+    'tool_registry': get_tool_registry,
+    'template_engine': get_template_engine,
+    'response_encoder': get_response_encoder,
+    'analysis_sessions': get_analysis_sessions,
+    'TOOLS_BODY': lambda: get_tools_body()[0],
+    'TOOLS_ETAG': lambda: get_tools_body()[1],
+}
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 @app.route('/')
 def index():
-    return render_template('index.html', tools=optimizer.tools)
+    return render_template('index.html', tools=get_optimizer().tools)
+
+def _count_request(endpoint: str, tool_id: str) -> None:
+    metrics.inc('requests_total', 'Optimization requests by endpoint and tool id.',
+                endpoint=endpoint, tool=tool_id if tool_id in get_optimizer().tools else 'unknown')
+
+def _count_error(endpoint: str, reason: str) -> None:
+    metrics.inc('errors_total', 'Rejected or failed requests by endpoint and reason.',
+                endpoint=endpoint, reason=reason)
+
+def _coalesced(prompt: str, key: Tuple, compute: Callable[[], Any]) -> Any:
+    coalescer = get_request_coalescer()
+    if coalescer is None or len(prompt) < COALESCE_MIN_CHARS:
+        return compute()
+    return coalescer.do(key, compute)
+
+def analyze_and_optimize(prompt: str, tool_id: str) -> Tuple[AnalysisResult, OptimizationResult]:
+    """Analysis and optimization of one /api/optimize request, shared by identical concurrent requests."""
+    optimizer = get_optimizer()
+    
+    def compute():
+        analysis = optimizer.analyze_prompt(prompt)
+        return analysis, optimizer.optimize_for_tool(prompt, tool_id, analysis)
+    
+    return _coalesced(prompt, ('optimize', prompt, tool_id), compute)
+
+PROMPT_TOO_LONG = f'Prompt too long (max {MAX_PROMPT_CHARS} characters)'
+
+@app.errorhandler(RequestEntityTooLarge)
+def request_too_large(e):
+    # The route pattern, not the path, so session ids do not each add a series
+    _count_error(request.url_rule.rule if request.url_rule is not None else 'unmatched', 'body_too_large')
+    return jsonify({'error': f'Request body too large (max {MAX_BODY_BYTES} bytes)'}), 413
 
 @app.route('/api/optimize', methods=['POST'])
 def optimize_prompt():
+    try:
+        with metrics.stage('json_parse'):
+            data = request.json
+    except BadRequest:
+        _count_error('/api/optimize', 'invalid_json')
+        raise
+    if not isinstance(data, dict):
+        data = {}
+    prompt = data.get('prompt', '')
+    tool_id = data.get('tool', '')
+    include_original = data.get('include_original', True)
+    
+    if not isinstance(prompt, str) or not isinstance(tool_id, str) or not prompt or not tool_id:
+        _count_error('/api/optimize', 'missing_input')
+        return jsonify({'error': 'Missing prompt or tool selection'}), 400
+    
+    if not isinstance(include_original, bool):
+        _count_error('/api/optimize', 'invalid_option')
+        return jsonify({'error': 'include_original must be a boolean'}), 400
+    
+    if len(prompt) > MAX_PROMPT_CHARS:
+        _count_error('/api/optimize', 'prompt_too_long')
+        return jsonify({'error': PROMPT_TOO_LONG}), 413
+    
+    _count_request('/api/optimize', tool_id)
+    optimizer = get_optimizer()
+    if tool_id not in optimizer.tools:
+        _count_error('/api/optimize', 'unknown_tool')
+        return jsonify({'error': 'Tool not found'}), 400
+    
+    analysis, result = analyze_and_optimize(prompt, tool_id)
+    
+    with metrics.stage('serialize'):
+        body = get_response_encoder().optimize_response(result, analysis, optimizer.tools[tool_id]['name'],
+                                                        prompt if include_original else None)
+    return Response(body, mimetype='application/json')
+
+@app.route('/api/optimize/advanced', methods=['POST'])
+def optimize_prompt_advanced():
     data = request.json
+    if not isinstance(data, dict):
+        _count_error('/api/optimize/advanced', 'invalid_json')
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
     prompt = data.get('prompt', '')
     tool_id = data.get('tool', '')
+    context = data.get('context')
+    include_original = data.get('include_original', True)
     
-    if not prompt or not tool_id:
+    if not isinstance(prompt, str) or not isinstance(tool_id, str) or not prompt or not tool_id:
+        _count_error('/api/optimize/advanced', 'missing_input')
         return jsonify({'error': 'Missing prompt or tool selection'}), 400
     
-    analysis = optimizer.analyze_prompt(prompt)
-    optimized_prompt, explanations = optimizer.optimize_for_tool(prompt, tool_id)
+    if context is not None and not isinstance(context, dict):
+        _count_error('/api/optimize/advanced', 'invalid_option')
+        return jsonify({'error': 'context must be an object'}), 400
+    
+    if not isinstance(include_original, bool):
+        _count_error('/api/optimize/advanced', 'invalid_option')
+        return jsonify({'error': 'include_original must be a boolean'}), 400
+    
+    if len(prompt) > MAX_PROMPT_CHARS:
+        _count_error('/api/optimize/advanced', 'prompt_too_long')
+        return jsonify({'error': PROMPT_TOO_LONG}), 413
+    
+    _count_request('/api/optimize/advanced', tool_id)
+    optimizer = get_optimizer()
+    if tool_id not in optimizer.tools:
+        _count_error('/api/optimize/advanced', 'unknown_tool')
+        return jsonify({'error': 'Tool not found'}), 400
+    
+    # Concurrent duplicates share the first request's result, skipped rules included
+    def compute():
+        pipeline = get_pipeline()
+        budget = RuleBudget(max_input_chars=RULE_MAX_CHARS, time_limit=RULE_TIME_LIMIT)
+        return pipeline.run(prompt, tool_id, context, budget)
+    
+    context_key = json.dumps(context, sort_keys=True, default=repr) if context else ''
+    result = _coalesced(prompt, ('advanced', prompt, tool_id, context_key), compute)
+    
+    with metrics.stage('serialize'):
+        payload = result.to_dict()
+        payload['tool'] = optimizer.tools[tool_id]['name']
+        if include_original:
+            payload['original_prompt'] = prompt
+        body = get_response_encoder().dumps(payload)
+    return Response(body, mimetype='application/json')
+
+@app.route('/api/optimize/batch', methods=['POST'])
+def optimize_batch():
+    data = request.json
+    if not isinstance(data, dict):
+        _count_error('/api/optimize/batch', 'invalid_json')
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    prompts = data.get('prompts')
+    tool_ids = data.get('tools')
+    
+    if not isinstance(prompts, list) or not isinstance(tool_ids, list) or not prompts or not tool_ids:
+        _count_error('/api/optimize/batch', 'missing_input')
+        return jsonify({'error': 'Missing prompts or tools list'}), 400
     
+    if len(prompts) * len(tool_ids) > MAX_BATCH_ITEMS:
+        _count_error('/api/optimize/batch', 'batch_too_large')
+        return jsonify({'error': f'Batch too large (max {MAX_BATCH_ITEMS} prompt/tool pairs)'}), 413
+    
+    optimizer = get_optimizer()
+    results = []
+    for prompt_index, prompt in enumerate(prompts):
+        if not isinstance(prompt, str) or not prompt:
+            results.extend({'prompt_index': prompt_index, 'tool': tool_id, 'error': 'Missing prompt'}
+                           for tool_id in tool_ids)
+            continue
+        if len(prompt) > MAX_PROMPT_CHARS:
+            _count_error('/api/optimize/batch', 'prompt_too_long')
+            results.extend({'prompt_index': prompt_index, 'tool': tool_id, 'error': PROMPT_TOO_LONG}
+                           for tool_id in tool_ids)
+            continue
+        
+        # Analyze once per prompt and share it across all requested tools
+        analysis = optimizer.analyze_prompt(prompt)
+        analysis_dict = analysis.to_dict()
+        for tool_id in tool_ids:
+            if not isinstance(tool_id, str):
+                _count_error('/api/optimize/batch', 'invalid_tool')
+                results.append({'prompt_index': prompt_index, 'tool': tool_id, 'error': 'Tool id must be a string'})
+                continue
+            _count_request('/api/optimize/batch', tool_id)
+            if tool_id not in optimizer.tools:
+                results.append({'prompt_index': prompt_index, 'tool': tool_id, 'error': 'Tool not found'})
+                continue
+            optimized_prompt, explanations = optimizer.optimize_for_tool(prompt, tool_id, analysis)
+            results.append({
+                'prompt_index': prompt_index,
+                'tool': tool_id,
+                'optimized_prompt': optimized_prompt,
+                'analysis': analysis_dict,
+                'explanations': explanations
+            })
+    
+    with metrics.stage('serialize'):
+        body = get_response_encoder().dumps({'results': results})
+    return Response(body, mimetype='application/json')
+
+@app.route('/api/template', methods=['POST'])
+def render_prompt_template():
+    data = request.json
+    if not isinstance(data, dict):
+        _count_error('/api/template', 'invalid_json')
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    prompt = data.get('prompt', '')
+    tool_id = data.get('tool', '')
+    
+    if not isinstance(prompt, str) or not isinstance(tool_id, str) or not prompt or not tool_id:
+        _count_error('/api/template', 'missing_input')
+        return jsonify({'error': 'Missing prompt or tool selection'}), 400
+    
+    if len(prompt) > MAX_PROMPT_CHARS:
+        _count_error('/api/template', 'prompt_too_long')
+        return jsonify({'error': PROMPT_TOO_LONG}), 413
+    
+    if tool_id not in get_tool_registry():
+        _count_error('/api/template', 'unknown_tool')
+        return jsonify({'error': 'Tool not found'}), 400
+    
+    analysis = get_optimizer().analyze_prompt(prompt)
+    result = get_template_engine().render(prompt, tool_id, analysis)
     return jsonify({
-        'original_prompt': prompt,
-        'optimized_prompt': optimized_prompt,
-        'analysis': analysis,
-        'explanations': explanations,
-        'tool': optimizer.tools[tool_id]['name']
+        'tool': tool_id,
+        'intent': analysis.intent,
+        'template': result.to_dict() if result is not None else None
     })
 
+@app.route('/api/analyze/sessions', methods=['POST'])
+def create_analysis_session():
+    data = request.json
+    if not isinstance(data, dict):
+        _count_error('/api/analyze/sessions', 'invalid_json')
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    prompt = data.get('prompt', '')
+    if not isinstance(prompt, str):
+        return jsonify({'error': 'prompt must be a string'}), 400
+    
+    try:
+        with metrics.stage('analyze_session'):
+            session_id, analysis = get_analysis_sessions().create(prompt)
+    except PromptTooLarge as e:
+        _count_error('/api/analyze/sessions', 'prompt_too_long')
+        return jsonify({'error': str(e)}), 413
+    return jsonify({'session_id': session_id, 'analysis': analysis.to_dict()}), 201
+
+@app.route('/api/analyze/sessions/<session_id>/edits', methods=['POST'])
+def edit_analysis_session(session_id):
+    data = request.json
+    if not isinstance(data, dict):
+        _count_error('/api/analyze/sessions', 'invalid_json')
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    try:
+        edits = parse_edits(data.get('edits'))
+        with metrics.stage('analyze_edits'):
+            analysis = get_analysis_sessions().edit(session_id, edits)
+    except PromptTooLarge as e:
+        _count_error('/api/analyze/sessions', 'prompt_too_long')
+        return jsonify({'error': str(e)}), 413
+    except ValueError as e:
+        _count_error('/api/analyze/sessions', 'invalid_edit')
+        return jsonify({'error': str(e)}), 400
+    
+    if analysis is None:
+        return jsonify({'error': 'Session not found'}), 404
+    return jsonify({'session_id': session_id, 'analysis': analysis.to_dict()})
+
+@app.route('/api/analyze/sessions/<session_id>', methods=['DELETE'])
+def delete_analysis_session(session_id):
+    if not get_analysis_sessions().delete(session_id):
+        return jsonify({'error': 'Session not found'}), 404
+    return '', 204
+
 @app.route('/api/tools')
 def get_tools():
-    return jsonify(optimizer.tools)
+    body, etag = get_tools_body()
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+@app.route('/api/stats')
+def get_stats():
+    optimize_cache = get_optimizer().cache
+    coalescer = get_request_coalescer()
+    stats = {
+        'optimize_cache': optimize_cache.stats() if optimize_cache is not None else None,
+        'coalescing': coalescer.stats() if coalescer is not None else None,
+    }
+    # The advanced optimizer is reported once a request has built it
+    if get_advanced_optimizer.initialized():
+        advanced = get_advanced_optimizer()
+        stats['advanced_cache'] = advanced.cache.stats() if advanced.cache is not None else None
+        stats['rules'] = advanced.rule_store.stats()
+    return jsonify(stats)
+
+@app.route('/metrics')
+def get_metrics():
+    if not metrics.enabled:
+        return jsonify({'error': 'Metrics are disabled (set OPTIMIZER_METRICS=1)'}), 404
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
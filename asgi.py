@@ -0,0 +1,218 @@
+"""Async (ASGI) serving mode for the optimizer API.
+
+Serves the same ``/``, ``/api/optimize`` and ``/api/tools`` routes as the
+Flask app in ``app.py`` from any ASGI server, e.g.::
+
+    uvicorn asgi:app --host 0.0.0.0 --port 8000
+
+Optimization is CPU-bound, so it runs in a bounded executor instead of on
+the event loop. Requests beyond the executor's capacity wait in a queue of
+limited length; once that is full the server answers ``503`` with a
+``Retry-After`` header instead of piling up latency. Request bodies and
+prompts are limited to the same sizes as in the Flask app (``413``
+otherwise); bodies are rejected while streaming in, before they are
+buffered in full. On shutdown the server
+stops accepting work, lets in-flight requests finish and then closes the
+executor.
+
+Environment variables:
+    OPTIMIZER_ASGI_WORKERS      executor size (default: CPU count)
+    OPTIMIZER_ASGI_EXECUTOR     'thread' (default) or 'process'
+    OPTIMIZER_ASGI_QUEUE        requests allowed to wait for a worker (default: 64)
+    OPTIMIZER_ASGI_RETRY_AFTER  seconds suggested to rejected clients (default: 1)
+    OPTIMIZER_ASGI_DRAIN_TIMEOUT  seconds to wait for in-flight requests on shutdown (default: 30)
+    OPTIMIZER_MAX_BODY_BYTES, OPTIMIZER_MAX_PROMPT_CHARS  request size limits, see app.py
+"""
+import asyncio
+import json
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from app import (MAX_BODY_BYTES, MAX_PROMPT_CHARS, PROMPT_TOO_LONG, analyze_and_optimize, app as flask_app,
+                 get_optimizer, get_response_encoder, get_tools_body)
+
+JSON_HEADERS = [(b'content-type', b'application/json')]
+
+
+def optimize_response(prompt: str, tool_id: str, include_original: bool = True) -> Tuple[int, bytes]:
+    """Optimize and serialize one /api/optimize request (runs in the executor)."""
+    optimizer = get_optimizer()
+    if tool_id not in optimizer.tools:
+        return 400, json.dumps({'error': 'Tool not found'}).encode('utf-8')
+    analysis, result = analyze_and_optimize(prompt, tool_id)
+    return 200, get_response_encoder().optimize_response(result, analysis, optimizer.tools[tool_id]['name'],
+                                                         prompt if include_original else None)
+
+
+class OptimizerASGI:
+    """ASGI application with bounded concurrency, backpressure and graceful shutdown."""
+
+    def __init__(self, workers: Optional[int] = None, executor: str = 'thread', max_queue: int = 64,
+                 retry_after: int = 1, drain_timeout: float = 30.0, max_body_bytes: int = MAX_BODY_BYTES):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_body_bytes = max_body_bytes
+        self.executor_kind = executor
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self.drain_timeout = drain_timeout
+        self.pending = 0
+        self.rejected = 0
+        self.draining = False
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._idle: Optional[asyncio.Event] = None
+        self._index: Optional[bytes] = None
+
+    def _start(self) -> None:
+        if self._executor is not None:
+            return
+        if self.executor_kind == 'process':
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='optimizer')
+        self._slots = asyncio.Semaphore(self.workers)
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    async def _shutdown(self) -> None:
+        self.draining = True
+        if self._executor is None:
+            return
+        try:
+            await asyncio.wait_for(self._idle.wait(), self.drain_timeout)
+        except asyncio.TimeoutError:
+            pass
+        executor, self._executor = self._executor, None
+        await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+
+    async def __call__(self, scope: Dict, receive, send) -> None:
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self._start()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self._shutdown()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _http(self, scope: Dict, receive, send) -> None:
+        self._start()
+        method, path = scope['method'], scope['path']
+        if path == '/' and method == 'GET':
+            await self._respond(send, 200, self._index_body(), [(b'content-type', b'text/html; charset=utf-8')])
+        elif path == '/api/tools' and method == 'GET':
+            await self._tools(scope, send)
+        elif path == '/api/optimize' and method == 'POST':
+            await self._optimize(scope, receive, send)
+        elif path in ('/', '/api/tools', '/api/optimize'):
+            await self._error(send, 405, 'Method not allowed')
+        else:
+            await self._error(send, 404, 'Not found')
+
+    def _index_body(self) -> bytes:
+        # Rendered on first request rather than at import (see app.py)
+        if self._index is None:
+            self._index = flask_app.jinja_env.get_template('index.html').render(
+                tools=get_optimizer().tools
+            ).encode('utf-8')
+        return self._index
+
+    async def _tools(self, scope: Dict, send) -> None:
+        tools_body, tools_etag = get_tools_body()
+        etag = f'"{tools_etag}"'.encode('ascii')
+        headers = dict(scope.get('headers', []))
+        if etag in [tag.strip() for tag in headers.get(b'if-none-match', b'').split(b',')]:
+            await self._respond(send, 304, b'', [(b'etag', etag)])
+        else:
+            await self._respond(send, 200, tools_body, JSON_HEADERS + [(b'etag', etag)])
+
+    async def _optimize(self, scope: Dict, receive, send) -> None:
+        if self.draining or self.pending >= self.workers + self.max_queue:
+            self.rejected += 1
+            await self._respond(send, 503, json.dumps({'error': 'Server busy, retry later'}).encode('utf-8'),
+                                JSON_HEADERS + [(b'retry-after', str(self.retry_after).encode('ascii'))])
+            return
+
+        self.pending += 1
+        self._idle.clear()
+        try:
+            body = await self._read_body(scope, receive, self.max_body_bytes)
+            if body is None:
+                await self._error(send, 413, f'Request body too large (max {self.max_body_bytes} bytes)')
+                return
+            try:
+                data = json.loads(body)
+            except ValueError:
+                await self._error(send, 400, 'Invalid JSON')
+                return
+            if not isinstance(data, dict):
+                data = {}
+            prompt = data.get('prompt', '')
+            tool_id = data.get('tool', '')
+            include_original = data.get('include_original', True)
+            if not isinstance(prompt, str) or not isinstance(tool_id, str) or not prompt or not tool_id:
+                await self._error(send, 400, 'Missing prompt or tool selection')
+                return
+            if not isinstance(include_original, bool):
+                await self._error(send, 400, 'include_original must be a boolean')
+                return
+            if len(prompt) > MAX_PROMPT_CHARS:
+                await self._error(send, 413, PROMPT_TOO_LONG)
+                return
+
+            async with self._slots:
+                loop = asyncio.get_running_loop()
+                status, payload = await loop.run_in_executor(self._executor, optimize_response, prompt, tool_id,
+                                                           include_original)
+            await self._respond(send, status, payload, JSON_HEADERS)
+        finally:
+            self.pending -= 1
+            if self.pending == 0:
+                self._idle.set()
+
+    @staticmethod
+    async def _read_body(scope: Dict, receive, limit: int) -> Optional[bytes]:
+        """Read the request body; returns None as soon as it exceeds ``limit`` bytes."""
+        content_length = dict(scope.get('headers', [])).get(b'content-length', b'')
+        if content_length.isdigit() and int(content_length) > limit:
+            return None
+        chunks: List[bytes] = []
+        size = 0
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                break
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if size > limit:
+                return None
+            chunks.append(chunk)
+            if not message.get('more_body'):
+                break
+        return b''.join(chunks)
+
+    async def _error(self, send, status: int, message: str) -> None:
+        await self._respond(send, status, json.dumps({'error': message}).encode('utf-8'), JSON_HEADERS)
+
+    @staticmethod
+    async def _respond(send, status: int, body: bytes, headers: List[Tuple[bytes, bytes]]) -> None:
+        headers = headers + [(b'content-length', str(len(body)).encode('ascii'))]
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body})
+
+
+app = OptimizerASGI(
+    workers=int(os.environ.get('OPTIMIZER_ASGI_WORKERS', '0')) or None,
+    executor=os.environ.get('OPTIMIZER_ASGI_EXECUTOR', 'thread'),
+    max_queue=int(os.environ.get('OPTIMIZER_ASGI_QUEUE', '64')),
+    retry_after=int(os.environ.get('OPTIMIZER_ASGI_RETRY_AFTER', '1')),
+    drain_timeout=float(os.environ.get('OPTIMIZER_ASGI_DRAIN_TIMEOUT', '30')),
+)
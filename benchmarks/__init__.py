@@ -0,0 +1,2 @@
+# Benchmark scripts package
+# Run individual benchmarks with `python -m benchmarks.<name>` from the repo root
@@ -0,0 +1,117 @@
+"""Load test: identical concurrent /api/optimize requests with and without coalescing.
+
+Client threads post duplicate-heavy traffic through the Flask app, as when
+a team shares a prompt: every distinct (prompt, tool) request is sent
+``--duplicates`` times in a row, so copies of it are in progress at the
+same time. The app runs in a fresh interpreter for each setting of
+``OPTIMIZER_COALESCE`` and counts the prompt analyses and tool rewrites it
+computes, next to the coalesced requests reported by /api/stats.
+
+Prompts shorter than ``OPTIMIZER_COALESCE_MIN_CHARS`` are never coalesced;
+pass ``--min-chars 0`` with ``--kind short`` to see why.
+
+Usage: python -m benchmarks.bench_coalescing [--distinct N] [--duplicates N] [--concurrency N]
+                                             [--kind large] [--min-chars N]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from .corpus import KINDS, make_corpus
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOOLS = ['copilot', 'cursor', 'replit', 'codewhisperer', 'tabnine', 'codium']
+
+
+def serve(bodies, concurrency):
+    """Post ``bodies`` from ``concurrency`` threads; returns compute counts and timings."""
+    import app
+
+    optimizer = app.get_optimizer()
+    counts = {'analyses': 0, 'rewrites': 0}
+    count_lock = threading.Lock()
+
+    def counted(name, function):
+        def call(*args):
+            with count_lock:
+                counts[name] += 1
+            return function(*args)
+        return call
+
+    optimizer.analyze_prompt = counted('analyses', optimizer.analyze_prompt)
+    optimizer._optimize = counted('rewrites', optimizer._optimize)
+
+    lock = threading.Lock()
+    next_index = iter(range(len(bodies)))
+    statuses = []
+
+    def client():
+        test_client = app.app.test_client()
+        while True:
+            with lock:
+                index = next(next_index, None)
+            if index is None:
+                break
+            response = test_client.post('/api/optimize', data=bodies[index], content_type='application/json')
+            statuses.append(response.status_code)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    assert statuses == [200] * len(bodies), set(statuses)
+    stats = app.app.test_client().get('/api/stats').get_json()
+    return dict(counts, seconds=elapsed, coalescing=stats['coalescing'])
+
+
+def run(coalesce, args):
+    env = dict(os.environ, OPTIMIZER_COALESCE='1' if coalesce else '0')
+    if args.min_chars is not None:
+        env['OPTIMIZER_COALESCE_MIN_CHARS'] = str(args.min_chars)
+    command = [sys.executable, '-m', 'benchmarks.bench_coalescing', '--serve',
+               '--distinct', str(args.distinct), '--duplicates', str(args.duplicates),
+               '--concurrency', str(args.concurrency), '--kind', args.kind]
+    output = subprocess.run(command, cwd=ROOT, env=env, check=True,
+                            stdout=subprocess.PIPE, universal_newlines=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--distinct', type=int, default=30, help='distinct (prompt, tool) requests')
+    parser.add_argument('--duplicates', type=int, default=16, help='copies of each request')
+    parser.add_argument('--concurrency', type=int, default=16, help='client threads')
+    parser.add_argument('--kind', choices=KINDS, default='large', help='prompt size')
+    parser.add_argument('--min-chars', type=int, help='override OPTIMIZER_COALESCE_MIN_CHARS')
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    prompts = make_corpus(args.distinct * 5)[args.kind][:args.distinct]  # large prompts are a fifth of the corpus
+    bodies = []
+    for index, prompt in enumerate(prompts):
+        body = json.dumps({'prompt': prompt, 'tool': TOOLS[index % len(TOOLS)]}).encode('utf-8')
+        bodies.extend([body] * args.duplicates)
+
+    if args.serve:
+        print(json.dumps(serve(bodies, args.concurrency)))
+        return
+
+    print(f"{len(bodies)} requests, {args.distinct} distinct {args.kind} prompts, {args.concurrency} clients")
+    print(f"{'coalescing':<12} {'analyses':>9} {'rewrites':>9} {'coalesced':>10} {'req/s':>8}")
+    for coalesce in (False, True):
+        result = run(coalesce, args)
+        coalesced = result['coalescing']['coalesced'] if result['coalescing'] else 0
+        print(f"{'on' if coalesce else 'off':<12} {result['analyses']:>9} {result['rewrites']:>9} "
+              f"{coalesced:>10} {len(bodies) / result['seconds']:>8.0f}")
+
+
+if __name__ == '__main__':
+    main()
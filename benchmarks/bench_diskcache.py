@@ -0,0 +1,69 @@
+"""Benchmark: per-process LRU caches vs one shared DiskCache across worker processes.
+
+Every worker serves the same stream of repeated prompts, as gunicorn workers
+behind a load balancer do. With per-process LRU caches each worker computes
+each distinct result itself. With a shared DiskCache a result computed by
+any worker is a hit for all the others. The benchmark reports the number of
+results computed, the hit rate and the wall time.
+
+Usage: python -m benchmarks.bench_diskcache [--prompts N] [--distinct N] [--workers N]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from optimizers.cache import LRUCache
+from optimizers.diskcache import DiskCache
+from optimizers.prompt_optimizer import PromptOptimizer
+
+from .corpus import mixed_prompts
+
+TOOLS = ['copilot', 'cursor', 'replit', 'codewhisperer', 'tabnine', 'codium']
+
+
+def serve(cache_path, requests):
+    optimizer = PromptOptimizer()
+    if cache_path:
+        optimizer.cache = DiskCache(cache_path, fingerprint=optimizer.profile_version)
+    else:
+        optimizer.cache = LRUCache(len(requests))
+    for prompt, tool_id in requests:
+        optimizer.optimize_for_tool(prompt, tool_id)
+    return optimizer.cache.hits, optimizer.cache.misses
+
+
+def run(cache_path, workloads):
+    start = time.perf_counter()
+    with ProcessPoolExecutor(len(workloads)) as pool:
+        counts = list(pool.map(serve, [cache_path] * len(workloads), workloads))
+    elapsed = time.perf_counter() - start
+    hits, misses = sum(h for h, _ in counts), sum(m for _, m in counts)
+    return elapsed, misses, hits / (hits + misses)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--prompts', type=int, default=5000, help='requests per worker')
+    parser.add_argument('--distinct', type=int, default=1000, help='distinct prompts in the stream')
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    distinct = mixed_prompts(args.distinct)
+    workloads = []
+    for worker in range(args.workers):
+        rng = random.Random(worker)
+        workloads.append([(rng.choice(distinct), rng.choice(TOOLS)) for _ in range(args.prompts)])
+
+    with tempfile.TemporaryDirectory() as directory:
+        variants = [('per-process LRU', None), ('shared DiskCache', os.path.join(directory, 'cache.db'))]
+        print(f"{'cache':<18} {'seconds':>8} {'computed':>9} {'hit rate':>9}")
+        for name, cache_path in variants:
+            elapsed, computed, hit_rate = run(cache_path, workloads)
+            print(f"{name:<18} {elapsed:>8.2f} {computed:>9} {hit_rate:>9.1%}")
+
+
+if __name__ == '__main__':
+    main()
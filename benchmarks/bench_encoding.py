@@ -0,0 +1,75 @@
+"""Benchmark: /api/optimize response encoding, stdlib dict dump vs ResponseEncoder backends.
+
+The baseline dumps the response dict the way jsonify does. Each installed
+backend then encodes the same responses with pre-encoded tool names and
+explanations, with and without the echoed original prompt.
+
+Usage: python -m benchmarks.bench_encoding [--prompts N] [--repeat N]
+"""
+import argparse
+import json
+import time
+
+from optimizers.encoding import ResponseEncoder, available_backends
+from optimizers.prompt_optimizer import PromptOptimizer
+
+from .corpus import make_corpus
+
+
+def build_responses(optimizer, prompts, tool_id):
+    responses = []
+    for prompt in prompts:
+        analysis = optimizer.analyze_prompt(prompt)
+        responses.append((prompt, analysis, optimizer.optimize_for_tool(prompt, tool_id, analysis)))
+    return responses
+
+
+def time_encoding(encode, responses, repeat):
+    best, size = float('inf'), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = sum(len(encode(*response)) for response in responses)
+        best = min(best, time.perf_counter() - start)
+    return best / len(responses), size / len(responses)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--prompts', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--tool', default='copilot')
+    args = parser.parse_args()
+
+    optimizer = PromptOptimizer()
+    tool_name = optimizer.tools[args.tool]['name']
+
+    def stdlib_dict(prompt, analysis, result):
+        return json.dumps({
+            'original_prompt': prompt,
+            'optimized_prompt': result.optimized_prompt,
+            'analysis': analysis.to_dict(),
+            'explanations': list(result.explanations),
+            'tool': tool_name
+        }, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+    variants = [('dict + json.dumps', stdlib_dict)]
+    for backend in available_backends():
+        encoder = ResponseEncoder(backend)
+        encoder.preload([tool_name] + optimizer.explanation_strings())
+        variants.append((f'{backend}', lambda prompt, analysis, result, encoder=encoder:
+                         encoder.optimize_response(result, analysis, tool_name, prompt)))
+        variants.append((f'{backend}, no original', lambda prompt, analysis, result, encoder=encoder:
+                         encoder.optimize_response(result, analysis, tool_name)))
+
+    for kind, prompts in make_corpus(args.prompts).items():
+        responses = build_responses(optimizer, prompts, args.tool)
+        print(f'{kind} prompts')
+        baseline = None
+        for name, encode in variants:
+            seconds, size = time_encoding(encode, responses, args.repeat)
+            baseline = baseline or seconds
+            print(f"  {name:<22} {seconds * 1e6:>9.1f} us {size:>9.0f} bytes {baseline / seconds:>6.2f}x")
+
+
+if __name__ == '__main__':
+    main()
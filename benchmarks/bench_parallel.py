@@ -0,0 +1,47 @@
+"""Benchmark: optimize_many throughput from 1 to N worker processes.
+
+Usage: python -m benchmarks.bench_parallel [--prompts N] [--max-workers N] [--chunksize K] [--engine basic|advanced]
+"""
+import argparse
+import os
+import time
+from typing import List
+
+from optimizers.parallel import optimize_many
+
+from .corpus import mixed_prompts
+
+TOOLS = ['copilot', 'cursor', 'replit', 'codewhisperer', 'tabnine', 'codium']
+
+def worker_counts(max_workers: int) -> List[int]:
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--prompts', type=int, default=5000)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunksize', type=int, default=64)
+    parser.add_argument('--engine', choices=('basic', 'advanced'), default='basic')
+    args = parser.parse_args()
+
+    prompts = mixed_prompts(args.prompts)
+    baseline = None
+    print(f"{'workers':>7} {'seconds':>8} {'prompts/s':>10} {'speedup':>8}")
+    for workers in worker_counts(args.max_workers):
+        start = time.perf_counter()
+        results = sum(1 for _ in optimize_many(prompts, TOOLS, workers=workers,
+                                               chunksize=args.chunksize, engine=args.engine))
+        elapsed = time.perf_counter() - start
+        assert results == len(prompts)
+        baseline = baseline or elapsed
+        print(f"{workers:>7} {elapsed:>8.2f} {len(prompts) / elapsed:>10.0f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark: OptimizationPipeline.run vs calling the optimizer stages one by one.
+
+The separate path calls analyze_prompt, optimize_for_tool, optimize_prompt,
+analyze_prompt_quality and suggest_improvements, as a client of both
+optimizers had to before /api/optimize/advanced. Caches are disabled so
+every stage runs. The results of both paths are checked to be equal.
+
+Usage: python -m benchmarks.bench_pipeline [--prompts N] [--repeat N] [--tool copilot]
+"""
+import argparse
+import time
+
+from optimizers.advanced_optimizer import AdvancedPromptOptimizer
+from optimizers.pipeline import OptimizationPipeline
+from optimizers.prompt_optimizer import PromptOptimizer
+
+from .corpus import make_corpus
+
+CONTEXT = {'security': True, 'testing': True}
+
+
+def separate_stages(basic, advanced, prompt, tool_id):
+    analysis = basic.analyze_prompt(prompt)
+    optimized = basic.optimize_for_tool(prompt, tool_id, analysis)
+    rewritten = advanced.optimize_prompt(prompt, tool_id, CONTEXT)
+    quality = advanced.analyze_prompt_quality(prompt)
+    return analysis, optimized, rewritten, quality, advanced.suggest_improvements(prompt, quality)
+
+
+def best_of(repeat, runs, prompts):
+    """Best time per prompt of each run; the runs alternate so machine noise hits them alike."""
+    best = [float('inf')] * len(runs)
+    for _ in range(repeat):
+        for index, run in enumerate(runs):
+            start = time.perf_counter()
+            for prompt in prompts:
+                run(prompt)
+            best[index] = min(best[index], time.perf_counter() - start)
+    return [seconds / len(prompts) for seconds in best]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--prompts', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--tool', default='copilot')
+    args = parser.parse_args()
+
+    basic, advanced = PromptOptimizer(), AdvancedPromptOptimizer()
+    pipeline = OptimizationPipeline(basic, advanced)
+
+    print(f"{'prompts':<8} {'separate':>12} {'pipeline':>12} {'speedup':>8}")
+    for kind, prompts in make_corpus(args.prompts).items():
+        for prompt in prompts:
+            result = pipeline.run(prompt, args.tool, CONTEXT)
+            expected = separate_stages(basic, advanced, prompt, args.tool)
+            assert (result.analysis, result.basic, result.advanced, result.quality, list(result.suggestions)) == expected
+
+        separate, combined = best_of(args.repeat, [
+            lambda prompt: separate_stages(basic, advanced, prompt, args.tool),
+            lambda prompt: pipeline.run(prompt, args.tool, CONTEXT),
+        ], prompts)
+        print(f"{kind:<8} {separate * 1e6:>9.1f} us {combined * 1e6:>9.1f} us {separate / combined:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
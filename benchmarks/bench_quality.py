@@ -0,0 +1,39 @@
+"""Benchmark: per-prompt analyze_prompt_quality vs analyze_prompt_quality_batch.
+
+Usage: python -m benchmarks.bench_quality [--prompts N]
+"""
+import argparse
+import time
+
+from optimizers.advanced_optimizer import AdvancedPromptOptimizer
+from optimizers.quality import QualityScorer, np
+
+from .corpus import mixed_prompts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--prompts', type=int, default=20000)
+    args = parser.parse_args()
+
+    prompts = mixed_prompts(args.prompts)
+    optimizer = AdvancedPromptOptimizer()
+
+    start = time.perf_counter()
+    expected = [optimizer.analyze_prompt_quality(prompt) for prompt in prompts]
+    baseline = time.perf_counter() - start
+    print(f"{'per-prompt':<22} {baseline:>7.3f}s")
+
+    variants = [('batch (pure Python)', QualityScorer(use_numpy=False))]
+    if np is not None:
+        variants.append(('batch (NumPy)', QualityScorer()))
+    for name, scorer in variants:
+        start = time.perf_counter()
+        results = scorer.score(prompts)
+        elapsed = time.perf_counter() - start
+        assert results == expected, name
+        print(f"{name:<22} {elapsed:>7.3f}s {baseline / elapsed:>6.2f}x")
+
+
+if __name__ == '__main__':
+    main()
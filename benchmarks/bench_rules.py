@@ -0,0 +1,80 @@
+"""Microbenchmark: rule application cost as the rule set grows.
+
+Compares the previous per-call path (sort the rules, then ``re.search`` and
+``re.sub`` each pattern) with CompiledRuleSet for 10 to 1,000 rules.
+
+Usage: python -m benchmarks.bench_rules [--repeat N]
+"""
+import argparse
+import random
+import re
+import time
+from typing import List, Tuple
+
+from optimizers.rules import CompiledRuleSet, OptimizationRule
+
+RULE_COUNTS = (10, 30, 100, 300, 1000)
+
+PROMPT = (
+    "Please implement a caching layer for the user service. It should fix the slow "
+    "profile lookups, refactor the session handling and write code that is easy to test. "
+    "The service is written in python and talks to a postgres database through an ORM."
+)
+
+
+def make_rules(count: int, seed: int = 0) -> List[OptimizationRule]:
+    """Generate ``count`` synthetic rules; a few of them match PROMPT."""
+    rng = random.Random(seed)
+    rules = [
+        OptimizationRule(pattern=r'implement (.+)', replacement=r'implement \1 with error handling'),
+        OptimizationRule(pattern=r'refactor', replacement='refactor safely', priority=2),
+        OptimizationRule(pattern=r'write code', replacement='write clean code', condition='python'),
+    ]
+    while len(rules) < count:
+        word = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(5, 9)))
+        rules.append(OptimizationRule(
+            pattern=word + r' (\w+)',
+            replacement=word + r' the \1',
+            priority=rng.randint(1, 3),
+        ))
+    return rules[:count]
+
+
+def legacy_apply(prompt: str, rules: List[OptimizationRule]) -> Tuple[str, List[str]]:
+    """The rule loop AdvancedPromptOptimizer used before CompiledRuleSet."""
+    optimized = prompt
+    applied = []
+    for rule in sorted(rules, key=lambda r: r.priority):
+        if rule.condition and rule.condition.lower() not in prompt.lower():
+            continue
+        if re.search(rule.pattern, optimized, re.IGNORECASE):
+            optimized = re.sub(rule.pattern, rule.replacement, optimized, flags=re.IGNORECASE)
+            applied.append(f"Applied rule: {rule.pattern} -> {rule.replacement}")
+    return optimized, applied
+
+
+def time_per_call(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=200, help='calls per measurement')
+    args = parser.parse_args()
+
+    print(f"{'rules':>6} {'legacy us':>11} {'compiled us':>12} {'speedup':>8}")
+    for count in RULE_COUNTS:
+        rules = make_rules(count)
+        compiled = CompiledRuleSet(rules)
+        assert legacy_apply(PROMPT, rules) == compiled.apply(PROMPT)
+
+        legacy = time_per_call(lambda: legacy_apply(PROMPT, rules), args.repeat)
+        fast = time_per_call(lambda: compiled.apply(PROMPT), args.repeat)
+        print(f"{count:>6} {legacy * 1e6:>11.1f} {fast * 1e6:>12.1f} {legacy / fast:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""Benchmark: cold-start time of app.py, broken down by module and initializer.
+
+Every run starts a fresh interpreter and times:
+
+- ``import app``, with per-module self times from ``python -X importtime``
+  grouped by top-level package (``optimizers.*`` modules are listed
+  separately);
+- the first POST request to ``--endpoint`` (/api/optimize by default) and
+  the lazy initializers it runs (see optimizers/lazy.py), and a second
+  request for comparison.
+
+The script exits with status 1 when the median of import plus first
+request is over ``--budget-ms``, so CI can run it as a cold-start check.
+
+Usage: python -m benchmarks.bench_startup [--runs N] [--budget-ms MS] [--top N]
+                                          [--endpoint /api/optimize/advanced]
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENDPOINTS = ('/api/optimize', '/api/optimize/advanced')
+
+# Cold-start budget for importing app.py and serving the first request
+COLD_START_BUDGET_MS = 750
+
+PROBE = '''
+import sys
+import time
+endpoint = sys.argv[1]
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+client = app.app.test_client()
+request = {'prompt': 'Implement a python function that validates email addresses', 'tool': 'copilot'}
+first_start = time.perf_counter()
+response = client.post(endpoint, json=request)
+first = time.perf_counter() - first_start
+assert response.status_code == 200
+second_start = time.perf_counter()
+assert client.post(endpoint, json=request).status_code == 200
+second = time.perf_counter() - second_start
+from optimizers.lazy import initializer_timings
+import json
+print(json.dumps({'import': imported - start, 'first_request': first, 'second_request': second,
+                  'initializers': initializer_timings(), 'first_response': response.get_json()}))
+'''
+
+_IMPORTTIME = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def run_probe(endpoint='/api/optimize'):
+    output = subprocess.run([sys.executable, '-c', PROBE, endpoint], cwd=ROOT, check=True,
+                            stdout=subprocess.PIPE, universal_newlines=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def import_times():
+    """Self time in seconds per imported module, from ``-X importtime``."""
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'], cwd=ROOT, check=True,
+                            stderr=subprocess.PIPE, universal_newlines=True).stderr
+    times = {}
+    for line in stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        if match:
+            times[match.group(4)] = int(match.group(1)) / 1e6
+    return times
+
+
+def group_modules(times):
+    groups = defaultdict(float)
+    for module, seconds in times.items():
+        top = module.split('.')[0]
+        groups[module if top in ('optimizers', 'app') else top] += seconds
+    return groups
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=COLD_START_BUDGET_MS)
+    parser.add_argument('--top', type=int, default=15, help='modules to list')
+    parser.add_argument('--endpoint', choices=ENDPOINTS, default=ENDPOINTS[0], help='endpoint of the timed requests')
+    args = parser.parse_args()
+
+    runs = [run_probe(args.endpoint) for _ in range(args.runs)]
+    modules = group_modules(import_times())
+
+    def median(key):
+        return statistics.median(run[key] for run in runs) * 1000
+
+    print(f"import app           {median('import'):>8.1f} ms")
+    print(f"first request        {median('first_request'):>8.1f} ms")
+    print(f"second request       {median('second_request'):>8.1f} ms")
+
+    print(f"\nimport self time by module (top {args.top}, one run)")
+    for module, seconds in sorted(modules.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {module:<30} {seconds * 1000:>8.2f} ms")
+
+    print("\ninitializers run by the first request (median ms)")
+    for name in runs[0]['initializers']:
+        total = statistics.median(run['initializers'][name]['total'] for run in runs) * 1000
+        own = statistics.median(run['initializers'][name]['self'] for run in runs) * 1000
+        print(f"  {name:<30} {total:>8.2f} total {own:>8.2f} self")
+
+    cold_start = median('import') + median('first_request')
+    within = cold_start <= args.budget_ms
+    print(f"\ncold start {cold_start:.1f} ms, budget {args.budget_ms:.0f} ms: {'ok' if within else 'OVER BUDGET'}")
+    sys.exit(0 if within else 1)
+
+
+if __name__ == '__main__':
+    main()
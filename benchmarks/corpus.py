@@ -0,0 +1,83 @@
+"""Seeded synthetic prompt corpus for benchmarks.
+
+Three prompt classes cover the shapes seen in production: short one-line
+queries, medium multi-sentence specifications and large prompts with a
+pasted code block (tens of kilobytes).
+"""
+import random
+from typing import Dict, List
+
+VERBS = ['create', 'build', 'implement', 'fix', 'debug', 'refactor', 'optimize', 'test', 'explain', 'write']
+SUBJECTS = ['function', 'class', 'method', 'API endpoint', 'database query', 'algorithm', 'server',
+            'client library', 'frontend component', 'backend service', 'unit test', 'parser']
+LANGUAGES = ['python', 'javascript', 'java', 'go', 'rust', 'typescript', 'ruby', 'php', '']
+DETAILS = [
+    'that validates email addresses', 'that handles pagination', 'with retries and timeouts',
+    'that caches results in memory', 'which returns a sorted list', 'for user authentication',
+    'that parses CSV input', 'that streams large files', 'with proper error handling',
+]
+REQUIREMENTS = [
+    'The input is a list of records and the output must be JSON.',
+    'It should handle errors and validate every parameter.',
+    'Performance matters, so consider the complexity of the algorithm.',
+    'Please add an example and document the return value.',
+    'It must work with the existing framework and database layer.',
+    'Keep the architecture simple and follow our team conventions.',
+]
+CODE_LINES = [
+    'def process(items, limit=None):',
+    '    results = []',
+    '    for index, item in enumerate(items):',
+    '        if limit is not None and index >= limit:',
+    '            break',
+    '        value = transform(item)  # TODO: fix error handling',
+    '        results.append(value)',
+    '    return results',
+    '',
+    'class Repository:',
+    '    def __init__(self, connection):',
+    '        self.connection = connection',
+    '    def fetch(self, key):',
+    '        return self.connection.execute("SELECT * FROM items WHERE id = ?", (key,))',
+    '',
+]
+
+KINDS = ('short', 'medium', 'large')
+
+
+def short_prompt(rng: random.Random) -> str:
+    language = rng.choice(LANGUAGES)
+    return ' '.join(filter(None, [rng.choice(VERBS).capitalize(), 'a', language, rng.choice(SUBJECTS)]))
+
+
+def medium_prompt(rng: random.Random) -> str:
+    head = f"{short_prompt(rng)} {rng.choice(DETAILS)}."
+    return ' '.join([head] + rng.sample(REQUIREMENTS, rng.randint(2, 5)))
+
+
+def large_prompt(rng: random.Random, target_chars: int = 20000) -> str:
+    lines = [medium_prompt(rng), '', '```']
+    size = 0
+    while size < target_chars:
+        line = rng.choice(CODE_LINES)
+        lines.append(line)
+        size += len(line) + 1
+    lines.append('```')
+    return '\n'.join(lines)
+
+
+def make_corpus(count: int = 50, seed: int = 0) -> Dict[str, List[str]]:
+    """Return ``count`` prompts of each kind, reproducible for a given seed."""
+    rng = random.Random(seed)
+    return {
+        'short': [short_prompt(rng) for _ in range(count)],
+        'medium': [medium_prompt(rng) for _ in range(count)],
+        'large': [large_prompt(rng, rng.randint(5000, 50000)) for _ in range(max(1, count // 5))],
+    }
+
+
+def mixed_prompts(count: int, seed: int = 0) -> List[str]:
+    """Return ``count`` prompts drawn from all kinds (mostly short and medium)."""
+    rng = random.Random(seed)
+    makers = [short_prompt] * 5 + [medium_prompt] * 4 + [lambda r: large_prompt(r, 5000)]
+    return [rng.choice(makers)(rng) for _ in range(count)]
@@ -0,0 +1,98 @@
+"""Local HTTP load test for the optimizer API.
+
+Sends POST /api/optimize requests from a pool of client threads to one or
+more running servers and reports requests/sec, latency percentiles and the
+status-code mix (503s are backpressure rejections). For example, with the
+Flask app on :5000 and ``uvicorn asgi:app --port 8000`` running::
+
+    python -m benchmarks.loadtest --url http://127.0.0.1:5000 --url http://127.0.0.1:8000
+
+Usage: python -m benchmarks.loadtest --url URL [--url URL ...] [--requests N] [--concurrency C]
+"""
+import argparse
+import http.client
+import json
+import threading
+import time
+from collections import Counter
+from typing import Dict, List
+from urllib.parse import urlsplit
+
+from .corpus import mixed_prompts
+
+TOOLS = ['copilot', 'cursor', 'replit', 'codewhisperer', 'tabnine', 'codium']
+
+
+def run_load(url: str, bodies: List[bytes], concurrency: int) -> Dict:
+    parts = urlsplit(url)
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    lock = threading.Lock()
+    next_index = iter(range(len(bodies)))
+
+    def client():
+        connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+        while True:
+            with lock:
+                index = next(next_index, None)
+            if index is None:
+                break
+            start = time.perf_counter()
+            try:
+                connection.request('POST', '/api/optimize', body=bodies[index],
+                                   headers={'Content-Type': 'application/json'})
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+                status = 'error'
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                statuses[status] += 1
+        connection.close()
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duration = time.perf_counter() - start
+
+    latencies.sort()
+
+    def percentile(fraction: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] * 1e3
+
+    return {
+        'requests_per_sec': len(latencies) / duration,
+        'p50_ms': percentile(0.50),
+        'p95_ms': percentile(0.95),
+        'p99_ms': percentile(0.99),
+        'statuses': dict(statuses),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.loadtest', description=__doc__.splitlines()[0])
+    parser.add_argument('--url', action='append', required=True, help='server base URL (repeatable)')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    args = parser.parse_args()
+
+    prompts = mixed_prompts(args.requests)
+    bodies = [json.dumps({'prompt': prompt, 'tool': TOOLS[i % len(TOOLS)]}).encode('utf-8')
+              for i, prompt in enumerate(prompts)]
+
+    print(f"{'url':<28} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  statuses")
+    for url in args.url:
+        result = run_load(url, bodies, args.concurrency)
+        print(f"{url:<28} {result['requests_per_sec']:>8.0f} {result['p50_ms']:>8.1f} "
+              f"{result['p95_ms']:>8.1f} {result['p99_ms']:>8.1f}  {result['statuses']}")
+
+
+if __name__ == '__main__':
+    main()
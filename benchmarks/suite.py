@@ -0,0 +1,147 @@
+"""Benchmark suite for the analysis, optimization and quality-scoring hot paths.
+
+Measures ops/sec and p50/p99 latency of PromptOptimizer.analyze_prompt,
+PromptOptimizer.optimize_for_tool, AdvancedPromptOptimizer.optimize_prompt
+and AdvancedPromptOptimizer.analyze_prompt_quality over a seeded synthetic
+corpus, per prompt kind and per tool.
+
+Usage:
+    python -m benchmarks.suite                          # print results
+    python -m benchmarks.suite --save benchmarks/baseline.json
+    python -m benchmarks.suite --compare benchmarks/baseline.json [--threshold 0.2]
+
+Compare mode exits with status 1 if any case lost more than ``threshold``
+of its throughput or its p99 latency grew by more than ``threshold``.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from itertools import cycle
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+from optimizers.advanced_optimizer import AdvancedPromptOptimizer
+from optimizers.prompt_optimizer import PromptOptimizer
+
+from .corpus import KINDS, make_corpus
+
+ADVANCED_CONTEXT = {'security': True, 'testing': True}
+
+Case = Tuple[str, Callable[[str], object], Sequence[str]]
+
+
+def build_cases(corpus: Dict[str, List[str]]) -> Iterator[Case]:
+    """Yield (name, function, inputs) for every benchmark case."""
+    basic = PromptOptimizer()
+    advanced = AdvancedPromptOptimizer()
+    everything = [prompt for kind in KINDS for prompt in corpus[kind]]
+
+    for kind in KINDS:
+        yield f'analyze_prompt/{kind}', basic.analyze_prompt, corpus[kind]
+    for tool_id in basic.tools:
+        yield (f'optimize_for_tool/{tool_id}',
+               lambda prompt, tool_id=tool_id: basic.optimize_for_tool(prompt, tool_id), everything)
+    for tool_id in basic.tools:
+        yield (f'advanced_optimize_prompt/{tool_id}',
+               lambda prompt, tool_id=tool_id: advanced.optimize_prompt(prompt, tool_id, ADVANCED_CONTEXT),
+               everything)
+    for kind in KINDS:
+        yield f'analyze_prompt_quality/{kind}', advanced.analyze_prompt_quality, corpus[kind]
+
+
+def measure(func: Callable[[str], object], inputs: Sequence[str], min_time: float,
+            min_samples: int = 20) -> Dict[str, float]:
+    """Time individual calls until ``min_time`` seconds and ``min_samples`` calls have passed."""
+    for prompt in inputs[:3]:  # warm up
+        func(prompt)
+
+    samples = []
+    total = 0
+    prompts = cycle(inputs)
+    while total < min_time * 1e9 or len(samples) < min_samples:
+        prompt = next(prompts)
+        start = time.perf_counter_ns()
+        func(prompt)
+        elapsed = time.perf_counter_ns() - start
+        samples.append(elapsed)
+        total += elapsed
+
+    samples.sort()
+    return {
+        'ops_per_sec': len(samples) / (total / 1e9),
+        'p50_us': samples[len(samples) // 2] / 1e3,
+        'p99_us': samples[min(len(samples) - 1, int(len(samples) * 0.99))] / 1e3,
+        'samples': len(samples),
+    }
+
+
+def run(min_time: float, seed: int, name_filter: str = '') -> Dict:
+    corpus = make_corpus(seed=seed)
+    results = {}
+    for name, func, inputs in build_cases(corpus):
+        if name_filter in name:
+            results[name] = measure(func, inputs, min_time)
+    return {
+        'meta': {'python': platform.python_version(), 'platform': platform.platform(), 'seed': seed},
+        'results': results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Return a description of every case that regressed beyond ``threshold``."""
+    regressions = []
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+        throughput_change = result['ops_per_sec'] / base['ops_per_sec'] - 1
+        p99_growth = result['p99_us'] / base['p99_us'] - 1
+        if throughput_change < -threshold or p99_growth > threshold:
+            regressions.append(f"{name}: throughput {throughput_change:+.0%}, p99 {p99_growth:+.0%}")
+    return regressions
+
+
+def print_results(report: Dict, baseline: Dict = None) -> None:
+    header = f"{'case':<40} {'ops/s':>10} {'p50 us':>10} {'p99 us':>10}"
+    print(header + (f" {'vs base':>8}" if baseline else ''))
+    for name, result in report['results'].items():
+        line = f"{name:<40} {result['ops_per_sec']:>10.0f} {result['p50_us']:>10.1f} {result['p99_us']:>10.1f}"
+        base = baseline and baseline['results'].get(name)
+        if base:
+            line += f" {result['ops_per_sec'] / base['ops_per_sec'] - 1:>+8.0%}"
+        print(line)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite', description=__doc__.splitlines()[0])
+    parser.add_argument('--min-time', type=float, default=0.3, help='seconds measured per case')
+    parser.add_argument('--seed', type=int, default=0, help='corpus seed')
+    parser.add_argument('--filter', default='', help='only run cases whose name contains this')
+    parser.add_argument('--save', metavar='PATH', help='write the results to a JSON baseline file')
+    parser.add_argument('--compare', metavar='PATH', help='compare against a JSON baseline file')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed regression fraction')
+    args = parser.parse_args(argv)
+
+    report = run(args.min_time, args.seed, args.filter)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_results(report, baseline)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+    if baseline:
+        regressions = compare(report, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,151 +1,118 @@
-import re
-import json
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
+from typing import Dict, List, Mapping, Tuple, Optional, Union
 
-@dataclass
-class OptimizationRule:
-    """Represents a single optimization rule."""
-    pattern: str
-    replacement: str
-    condition: Optional[str] = None
-    priority: int = 1
+from .cache import LRUCache, make_key
+from .quality import (COMPLETENESS_INDICATORS, SPECIFIC_WORDS, TECHNICAL_TERMS,
+                      TECHNICAL_TERMS_FOR_FULL_SCORE, QualityScorer, average_sentence_length)
+from .results import OptimizationResult, QualityMetrics
+from .rules import CompiledRuleSet, OptimizationRule, RuleBudget
+from .rulestore import RuleBook, RuleStore
+from .scanner import PromptText
 
 class AdvancedPromptOptimizer:
     """Advanced prompt optimizer with pattern-based rules and context awareness."""
     
-    def __init__(self):
-        self.optimization_rules = self._load_optimization_rules()
-        self.context_patterns = self._load_context_patterns()
+    def __init__(self, cache: Optional[LRUCache] = None, rules: Optional[RuleStore] = None):
+        """``rules`` defaults to a RuleStore for optimization_rules.json, reloaded when the file changes."""
+        self.cache = cache
+        self.rule_store = rules or RuleStore()
+        self.quality_scorer = QualityScorer()
+        
+    @property
+    def optimization_rules(self) -> Mapping[str, Tuple[OptimizationRule, ...]]:
+        """Rules per tool from the current rule book."""
+        return self.rule_store.current.rules
+    
+    @property
+    def compiled_rules(self) -> Mapping[str, CompiledRuleSet]:
+        """Compiled rule sets per tool from the current rule book."""
+        return self.rule_store.current.compiled
+    
+    @property
+    def context_patterns(self) -> Mapping[str, Tuple[str, ...]]:
+        """Context enhancement patterns from the current rule book."""
+        return self.rule_store.current.context_patterns
+    
+    def optimize_prompt(self, prompt: str, tool: str, context: Dict = None,
+                        budget: Optional[RuleBudget] = None, text: Optional[PromptText] = None) -> OptimizationResult:
+        """Optimize a prompt using advanced pattern matching and context awareness.
+
+        The result unpacks as ``(optimized_prompt, applied_optimizations)``.
+        With a ``budget``, tool rules that would exceed its size or time
+        limit are skipped and listed in ``budget.skipped``; such partial
+        results are not cached. ``text`` is the prompt's PromptText, if the
+        caller has already built it.
+        """
+        # One rule book for the whole request, even if a reload happens meanwhile
+        book = self.rule_store.current
+        if self.cache is None:
+            return self._optimize(prompt, tool, context, book, budget, text)
+        
+        if budget is None:
+            return self.cache.get_or_compute(
+                make_key(prompt, tool, context, book.version),
+                lambda: self._optimize(prompt, tool, context, book, text=text)
+            )
         
-    def _load_optimization_rules(self) -> Dict[str, List[OptimizationRule]]:
-        """Load optimization rules for each tool."""
-        return {
-            'copilot': [
-                OptimizationRule(
-                    pattern=r'create a function',
-                    replacement='create a well-documented function with type hints',
-                    condition='python'
-                ),
-                OptimizationRule(
-                    pattern=r'write code',
-                    replacement='write clean, readable code with appropriate comments',
-                    priority=2
-                ),
-                OptimizationRule(
-                    pattern=r'implement (.+)',
-                    replacement=r'implement \1 with proper error handling and edge case consideration',
-                    priority=1
-                )
-            ],
-            'cursor': [
-                OptimizationRule(
-                    pattern=r'fix (.+)',
-                    replacement=r'identify and fix \1 in the specified file location',
-                    priority=1
-                ),
-                OptimizationRule(
-                    pattern=r'refactor',
-                    replacement='refactor the code while maintaining existing functionality',
-                    priority=2
-                )
-            ],
-            'replit': [
-                OptimizationRule(
-                    pattern=r'create (.+)',
-                    replacement=r'create \1 with step-by-step explanations for learning',
-                    priority=1
-                ),
-                OptimizationRule(
-                    pattern=r'build (.+)',
-                    replacement=r'build \1 as a complete, runnable example with educational comments',
-                    priority=1
-                )
-            ]
-        }
+        key = make_key(prompt, tool, context, book.version)
+        result = self.cache.get(key)
+        if result is None:
+            result = self._optimize(prompt, tool, context, book, budget, text)
+            if not budget.skipped:
+                self.cache.set(key, result)
+        return result
     
-    def _load_context_patterns(self) -> Dict[str, List[str]]:
-        """Load context enhancement patterns."""
-        return {
-            'security': [
-                'include input validation',
-                'implement proper error handling',
-                'consider security best practices',
-                'add authentication if needed'
-            ],
-            'performance': [
-                'optimize for performance',
-                'consider memory usage',
-                'implement efficient algorithms',
-                'add caching where appropriate'
-            ],
-            'testing': [
-                'include unit tests',
-                'cover edge cases',
-                'add integration tests',
-                'implement test fixtures'
-            ],
-            'documentation': [
-                'add comprehensive docstrings',
-                'include usage examples',
-                'document parameters and return values',
-                'add inline comments for complex logic'
-            ]
-        }
-    
-    def optimize_prompt(self, prompt: str, tool: str, context: Dict = None) -> Tuple[str, List[str]]:
-        """Optimize a prompt using advanced pattern matching and context awareness."""
+    def _optimize(self, prompt: str, tool: str, context: Optional[Dict], book: RuleBook,
+                  budget: Optional[RuleBudget] = None, text: Optional[PromptText] = None) -> OptimizationResult:
         optimized_prompt = prompt
         applied_optimizations = []
         
         # Apply tool-specific rules
-        if tool in self.optimization_rules:
+        if tool in book.compiled:
             optimized_prompt, tool_optimizations = self._apply_tool_rules(
-                optimized_prompt, self.optimization_rules[tool]
+                optimized_prompt, book.compiled[tool], budget, text.lower if text is not None else None
             )
             applied_optimizations.extend(tool_optimizations)
         
         # Apply context-based enhancements
         if context:
             optimized_prompt, context_optimizations = self._apply_context_enhancements(
-                optimized_prompt, context
+                optimized_prompt, context, book.context_patterns
             )
             applied_optimizations.extend(context_optimizations)
         
-        # Apply general improvements
+        # Apply general improvements; the shared text still applies if only text was appended
+        if text is not None:
+            text = text.extended(optimized_prompt[len(prompt):]) if optimized_prompt.startswith(prompt) else None
         optimized_prompt, general_optimizations = self._apply_general_improvements(
-            optimized_prompt, tool
+            optimized_prompt, tool, text
         )
         applied_optimizations.extend(general_optimizations)
         
-        return optimized_prompt, applied_optimizations
+        return OptimizationResult(optimized_prompt, applied_optimizations)
     
-    def _apply_tool_rules(self, prompt: str, rules: List[OptimizationRule]) -> Tuple[str, List[str]]:
-        """Apply tool-specific optimization rules."""
-        optimized = prompt
-        applied = []
-        
-        # Sort rules by priority
-        sorted_rules = sorted(rules, key=lambda r: r.priority)
-        
-        for rule in sorted_rules:
-            if rule.condition and rule.condition.lower() not in prompt.lower():
-                continue
-                
-            if re.search(rule.pattern, optimized, re.IGNORECASE):
-                optimized = re.sub(rule.pattern, rule.replacement, optimized, flags=re.IGNORECASE)
-                applied.append(f"Applied rule: {rule.pattern} -> {rule.replacement}")
-        
-        return optimized, applied
-    
-    def _apply_context_enhancements(self, prompt: str, context: Dict) -> Tuple[str, List[str]]:
+    def _apply_tool_rules(self, prompt: str, rules: Union[CompiledRuleSet, List[OptimizationRule]],
+                          budget: Optional[RuleBudget] = None,
+                          prompt_lower: Optional[str] = None) -> Tuple[str, List[str]]:
+        """Apply tool-specific optimization rules.
+
+        ``rules`` is a CompiledRuleSet or a plain list of OptimizationRule,
+        which is compiled on the fly.
+        """
+        if not isinstance(rules, CompiledRuleSet):
+            rules = CompiledRuleSet(rules)
+        return rules.apply(prompt, budget, prompt_lower)
+    
+    def _apply_context_enhancements(self, prompt: str, context: Dict,
+                                    context_patterns: Optional[Mapping[str, Tuple[str, ...]]] = None) -> Tuple[str, List[str]]:
         """Apply context-based enhancements."""
         optimized = prompt
         applied = []
+        if context_patterns is None:
+            context_patterns = self.context_patterns
         
         for context_type, requirements in context.items():
-            if context_type in self.context_patterns:
-                enhancements = self.context_patterns[context_type]
+            if context_type in context_patterns:
+                enhancements = context_patterns[context_type]
                 if requirements:  # If context is requested
                     selected_enhancements = enhancements[:2]  # Limit to avoid overwhelming
                     enhancement_text = '. '.join(selected_enhancements)
@@ -154,55 +121,61 @@ class AdvancedPromptOptimizer:
         
         return optimized, applied
     
-    def _apply_general_improvements(self, prompt: str, tool: str) -> Tuple[str, List[str]]:
+    def _apply_general_improvements(self, prompt: str, tool: str,
+                                    text: Optional[PromptText] = None) -> Tuple[str, List[str]]:
         """Apply general improvements based on best practices."""
         optimized = prompt
         applied = []
+        if text is None:
+            text = PromptText(prompt)
+        prompt_lower = text.lower
         
         # Add specificity if prompt is too vague
-        if len(prompt.split()) < 10:
+        if text.word_count < 10:
             optimized += "\n\nPlease provide a complete, detailed implementation."
             applied.append("Added specificity to short prompt")
         
         # Add language context if not specified
         languages = ['python', 'javascript', 'java', 'c++', 'c#', 'go', 'rust']
-        if not any(lang in prompt.lower() for lang in languages):
+        if not any(lang in prompt_lower for lang in languages):
             optimized = f"Using an appropriate programming language, {optimized}"
             applied.append("Added programming language context")
         
         # Tool-specific general improvements
         if tool == 'copilot':
-            if 'function' in prompt.lower() and 'type' not in prompt.lower():
+            if 'function' in prompt_lower and 'type' not in prompt_lower:
                 optimized += "\n\nInclude appropriate type annotations."
                 applied.append("Added type annotation requirement for Copilot")
         
         elif tool == 'replit':
-            if 'explain' not in prompt.lower():
+            if 'explain' not in prompt_lower:
                 optimized += "\n\nInclude explanations to help with learning."
                 applied.append("Added educational context for Replit")
         
         elif tool == 'codewhisperer':
-            if 'security' not in prompt.lower():
+            if 'security' not in prompt_lower:
                 optimized += "\n\nConsider security best practices."
                 applied.append("Added security consideration for CodeWhisperer")
         
         return optimized, applied
     
-    def analyze_prompt_quality(self, prompt: str) -> Dict[str, float]:
+    def analyze_prompt_quality(self, prompt: str) -> QualityMetrics:
         """Analyze the quality of a prompt and return metrics."""
-        metrics = {
-            'specificity': self._calculate_specificity(prompt),
-            'clarity': self._calculate_clarity(prompt),
-            'completeness': self._calculate_completeness(prompt),
-            'technical_depth': self._calculate_technical_depth(prompt)
-        }
-        return metrics
+        return self.quality_scorer.score_text(PromptText(prompt))
+    
+    def analyze_prompt_quality_batch(self, prompts: List[str]) -> List[QualityMetrics]:
+        """Analyze the quality of many prompts at once.
+
+        Returns the same metrics as analyze_prompt_quality for each prompt,
+        computed from a shared term-presence matrix.
+        """
+        return self.quality_scorer.score(prompts)
     
     def _calculate_specificity(self, prompt: str) -> float:
         """Calculate how specific the prompt is (0-1 scale)."""
-        specific_words = ['function', 'class', 'method', 'variable', 'parameter', 'return', 'input', 'output']
         word_count = len(prompt.split())
-        specific_count = sum(1 for word in specific_words if word in prompt.lower())
+        prompt_lower = prompt.lower()
+        specific_count = sum(1 for word in SPECIFIC_WORDS if word in prompt_lower)
         
         if word_count == 0:
             return 0.0
@@ -212,8 +185,7 @@ class AdvancedPromptOptimizer:
     def _calculate_clarity(self, prompt: str) -> float:
         """Calculate how clear the prompt is (0-1 scale)."""
         # Simple heuristic: longer sentences and complex words reduce clarity
-        sentences = prompt.split('.')
-        avg_sentence_length = sum(len(s.split()) for s in sentences) / len(sentences) if sentences else 0
+        avg_sentence_length = average_sentence_length(prompt)
         
         # Optimal sentence length is around 15-20 words
         clarity_score = 1.0 - abs(avg_sentence_length - 17.5) / 17.5
@@ -221,28 +193,19 @@ class AdvancedPromptOptimizer:
     
     def _calculate_completeness(self, prompt: str) -> float:
         """Calculate how complete the prompt is (0-1 scale)."""
-        completeness_indicators = [
-            'input', 'output', 'example', 'requirement', 'constraint',
-            'error', 'handle', 'test', 'validate'
-        ]
-        
-        present_indicators = sum(1 for indicator in completeness_indicators 
-                               if indicator in prompt.lower())
+        prompt_lower = prompt.lower()
+        present_indicators = sum(1 for indicator in COMPLETENESS_INDICATORS
+                               if indicator in prompt_lower)
         
-        return min(present_indicators / len(completeness_indicators), 1.0)
+        return min(present_indicators / len(COMPLETENESS_INDICATORS), 1.0)
     
     def _calculate_technical_depth(self, prompt: str) -> float:
         """Calculate the technical depth of the prompt (0-1 scale)."""
-        technical_terms = [
-            'algorithm', 'data structure', 'complexity', 'performance',
-            'optimization', 'pattern', 'architecture', 'framework',
-            'library', 'api', 'database', 'async', 'concurrent'
-        ]
-        
-        present_terms = sum(1 for term in technical_terms if term in prompt.lower())
-        return min(present_terms / 5, 1.0)  # Normalize to 5 terms for full score
+        prompt_lower = prompt.lower()
+        present_terms = sum(1 for term in TECHNICAL_TERMS if term in prompt_lower)
+        return min(present_terms / TECHNICAL_TERMS_FOR_FULL_SCORE, 1.0)
     
-    def suggest_improvements(self, prompt: str, quality_metrics: Dict[str, float]) -> List[str]:
+    def suggest_improvements(self, prompt: str, quality_metrics: Union[QualityMetrics, Dict[str, float]]) -> List[str]:
         """Suggest improvements based on quality metrics."""
         suggestions = []
         
@@ -260,7 +223,7 @@ class AdvancedPromptOptimizer:
         
         return suggestions
 
-# Example usage and testing
+# Example usage; run from the repository root with: python -m optimizers.advanced_optimizer
 if __name__ == "__main__":
     optimizer = AdvancedPromptOptimizer()
     
@@ -0,0 +1,141 @@
+"""Command-line bulk optimizer.
+
+Streams prompts as JSON lines from a file or stdin and writes one NDJSON
+result per prompt/tool pair to stdout. Input lines are either a JSON string
+or an object with a ``prompt`` and optional ``id``, ``tools`` and
+``context`` overrides. Everything is processed lazily, so memory use does not
+grow with the size of the input.
+
+Usage: python -m optimizers.cli [INPUT] [--tools copilot,cursor] [--engine advanced]
+                                [--context security,testing] [--workers N]
+"""
+import argparse
+import json
+import sys
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+from .parallel import run_tasks
+from .prompt_optimizer import PromptOptimizer
+
+ENGINES = ('basic', 'advanced')
+
+
+def read_records(stream: TextIO) -> Iterator[Dict]:
+    """Yield one record per non-blank input line; unparsable or invalid lines carry an ``error``."""
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            yield {'line': line_number, 'error': f'Invalid JSON: {e}'}
+            continue
+        if isinstance(data, str):
+            data = {'prompt': data}
+        if not isinstance(data, dict) or not isinstance(data.get('prompt'), str) or not data['prompt']:
+            yield {'line': line_number, 'error': 'Missing prompt'}
+            continue
+        tools = data.get('tools')
+        if tools is not None and (not isinstance(tools, list) or not all(isinstance(tool, str) for tool in tools)):
+            yield {'line': line_number, 'error': 'tools must be a list of tool ids'}
+            continue
+        if data.get('context') is not None and not isinstance(data['context'], dict):
+            yield {'line': line_number, 'error': 'context must be an object'}
+            continue
+        data['line'] = line_number
+        yield data
+
+
+def optimize_records(records: Iterable[Dict], tools: Optional[List[str]] = None, engine: str = 'basic',
+                     context: Optional[Dict] = None, cache_size: int = 0, workers: int = 1,
+                     chunksize: int = 64) -> Iterator[Dict]:
+    """Yield a result for every record and tool, in input order.
+
+    ``tools`` defaults to every tool PromptOptimizer knows about. With more
+    than one worker the prompts are optimized in a process pool.
+    """
+    tools = tools or list(PromptOptimizer().tools)
+    pending = deque()
+
+    def tasks():
+        for record in records:
+            pending.append(record)
+            if 'error' in record:
+                # An empty task keeps the error's place in the output, so
+                # ``pending`` never holds more than run_tasks has in flight
+                yield '', [], None
+            else:
+                yield record['prompt'], record.get('tools') or tools, record.get('context', context)
+
+    for results in run_tasks(tasks(), engine, workers, chunksize, cache_size):
+        record = pending.popleft()
+        if 'error' in record:
+            yield _error_result(record)
+            continue
+        for result in results:
+            yield dict(_result_base(record), **result)
+
+
+def _result_base(record: Dict) -> Dict:
+    base = {'line': record['line']}
+    if 'id' in record:
+        base['id'] = record['id']
+    return base
+
+
+def _error_result(record: Dict) -> Dict:
+    return dict(_result_base(record), error=record['error'])
+
+
+def write_ndjson(results: Iterable[Dict], stream: TextIO) -> int:
+    """Write each result as one JSON line and return the number written."""
+    count = 0
+    for result in results:
+        stream.write(json.dumps(result))
+        stream.write('\n')
+        count += 1
+    return count
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='python -m optimizers.cli',
+        description='Optimize prompts from JSON lines and write NDJSON results to stdout.'
+    )
+    parser.add_argument('input', nargs='?', default='-',
+                        help="file with one JSON prompt per line ('-' for stdin, the default)")
+    parser.add_argument('--tools', default='',
+                        help='comma-separated tool ids (default: all tools)')
+    parser.add_argument('--engine', choices=ENGINES, default='basic',
+                        help='basic PromptOptimizer or rule-based AdvancedPromptOptimizer')
+    parser.add_argument('--context', default='',
+                        help='comma-separated context flags for the advanced engine, e.g. security,testing')
+    parser.add_argument('--cache-size', type=int, default=0,
+                        help='LRU cache entries for repeated prompts (default: disabled)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='worker processes (default: 1, i.e. run in this process)')
+    parser.add_argument('--chunksize', type=int, default=64,
+                        help='prompts sent to a worker per task (default: 64)')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    tools = [tool.strip() for tool in args.tools.split(',') if tool.strip()]
+    context = {flag.strip(): True for flag in args.context.split(',') if flag.strip()} or None
+
+    source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    try:
+        results = optimize_records(read_records(source), tools, args.engine, context,
+                                   args.cache_size, args.workers, args.chunksize)
+        write_ndjson(results, sys.stdout)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,269 @@
+"""SQLite-backed result cache shared by all worker processes on a host.
+
+An in-process LRUCache is duplicated in every gunicorn worker and lost on
+restart. A DiskCache keeps optimization results in one SQLite file instead,
+so a result computed by any worker is reused by all of them and survives
+restarts. It has the same interface as LRUCache and is a drop-in
+replacement for it.
+
+Keys are content hashes from ``make_key`` and already include the versions
+of the rules and tool profiles a result was computed with. The cache also
+records a ``fingerprint`` of those definitions: a process opening the file
+with a different fingerprint drops every entry. That frees the space at
+once instead of waiting for eviction.
+
+The total size of the stored values is capped at ``max_bytes``. When a write
+goes over the cap, the least recently used entries are removed. Recency is
+tracked with a granularity of ``touch_interval`` seconds, so that most hits
+are plain reads. Eviction, ``len()`` and ``stats()`` read only the small
+per-entry columns, never the values, and a value is decoded only when a
+lookup hits it.
+
+Values are stored as JSON (never pickle, since the file is shared). SQLite
+errors such as a lock timeout or a full disk count as misses or skipped
+writes, so a broken cache file slows requests down but does not fail them.
+Opening the cache waits for a locked file for up to ``timeout`` seconds and
+then raises ``sqlite3.Error``; callers can fall back to an in-process cache.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator
+
+from .results import OptimizationResult
+
+_MISSING = object()
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value)",
+    "INSERT OR IGNORE INTO meta (name, value) VALUES ('fingerprint', ''), ('bytes', 0)",
+    # The value goes last so reads of the other columns skip its overflow pages
+    "CREATE TABLE IF NOT EXISTS entries ("
+    " key TEXT NOT NULL UNIQUE, size INTEGER NOT NULL, accessed REAL NOT NULL, value BLOB NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)",
+    # The running total of value sizes is kept in the same transaction as every write
+    "CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN"
+    " UPDATE meta SET value = value + NEW.size WHERE name = 'bytes'; END",
+    "CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN"
+    " UPDATE meta SET value = value - OLD.size WHERE name = 'bytes'; END",
+)
+
+# Most entries a single write evicts; the cap is restored by later writes if this is not enough
+_EVICTION_SCAN = 1024
+
+# First and longest wait between attempts to open a locked cache file, in seconds
+_RETRY_DELAY = 0.01
+_MAX_RETRY_DELAY = 0.25
+
+
+@contextmanager
+def _transaction(connection: sqlite3.Connection) -> Iterator[None]:
+    # Take the write lock up front so concurrent writers wait instead of failing to upgrade
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+
+
+def encode_result(result: OptimizationResult) -> bytes:
+    return result.to_json().encode('utf-8')
+
+
+def decode_result(data: bytes) -> OptimizationResult:
+    payload = json.loads(data)
+    return OptimizationResult(payload['optimized_prompt'], payload['explanations'])
+
+
+class DiskCache:
+    """Size-bounded, process- and thread-safe LRU cache in an SQLite file.
+
+    Stores OptimizationResults by default. For other values, pass
+    ``encode``/``decode`` functions that convert them to and from bytes.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024, fingerprint: str = '',
+                 encode: Callable[[Any], bytes] = encode_result,
+                 decode: Callable[[bytes], Any] = decode_result,
+                 touch_interval: float = 1.0, timeout: float = 5.0):
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        self.path = path
+        self.max_bytes = max_bytes
+        self.fingerprint = fingerprint
+        self.touch_interval = touch_interval
+        self.timeout = timeout
+        self._encode = encode
+        self._decode = decode
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+        self._initialize()
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread, reopened in forked workers
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            local.connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            local.connection.execute("PRAGMA synchronous=NORMAL")
+            local.pid = os.getpid()
+        return local.connection
+
+    def _initialize(self) -> None:
+        # Workers starting together race for the file. Switching to WAL needs
+        # an exclusive lock that SQLite does not always wait for, so a locked
+        # file is retried with backoff until ``timeout`` has passed.
+        deadline = time.monotonic() + self.timeout
+        delay = _RETRY_DELAY
+        while True:
+            try:
+                self._create()
+                return
+            except sqlite3.OperationalError as e:
+                locked = 'locked' in str(e) or 'busy' in str(e)
+                if not locked or time.monotonic() + delay > deadline:
+                    raise
+            time.sleep(delay)
+            delay = min(delay * 2, _MAX_RETRY_DELAY)
+
+    def _create(self) -> None:
+        connection = self._connection()
+        # WAL lets readers in other processes continue while one process writes.
+        # The mode is stored in the file, so only its first user switches it.
+        if connection.execute("PRAGMA journal_mode").fetchone()[0].lower() != 'wal':
+            connection.execute("PRAGMA journal_mode=WAL")
+        with _transaction(connection):
+            for statement in _SCHEMA:
+                connection.execute(statement)
+            stored = connection.execute("SELECT value FROM meta WHERE name = 'fingerprint'").fetchone()[0]
+            if stored != self.fingerprint:
+                connection.execute("DELETE FROM entries")
+                connection.execute("UPDATE meta SET value = ? WHERE name = 'fingerprint'", (self.fingerprint,))
+
+    def _count(self, **counters: int) -> None:
+        with self._lock:
+            for name, value in counters.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def __len__(self) -> int:
+        try:
+            return self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for ``key`` or ``default``."""
+        try:
+            connection = self._connection()
+            row = connection.execute(
+                "SELECT rowid, accessed, value FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._count(misses=1)
+                return default
+            rowid, accessed, data = row
+            now = time.time()
+            if now - accessed >= self.touch_interval:
+                connection.execute("UPDATE entries SET accessed = ? WHERE rowid = ?", (now, rowid))
+        except sqlite3.Error:
+            self._count(misses=1, errors=1)
+            return default
+        try:
+            value = self._decode(data)
+        except (ValueError, KeyError, TypeError):
+            # Unreadable entry, e.g. written by an incompatible version
+            self.delete(key)
+            self._count(misses=1, errors=1)
+            return default
+        self._count(hits=1)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store ``value`` under ``key``, evicting least recently used entries if over the size cap."""
+        data = self._encode(value)
+        if len(data) > self.max_bytes:
+            return
+        try:
+            connection = self._connection()
+            with _transaction(connection):
+                connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+                connection.execute(
+                    "INSERT INTO entries (key, size, accessed, value) VALUES (?, ?, ?, ?)",
+                    (key, len(data), time.time(), data)
+                )
+                excess = connection.execute("SELECT value FROM meta WHERE name = 'bytes'").fetchone()[0] - self.max_bytes
+                evicted = self._evict(connection, excess) if excess > 0 else 0
+        except sqlite3.Error:
+            self._count(errors=1)
+            return
+        if evicted:
+            self._count(evictions=evicted)
+
+    @staticmethod
+    def _evict(connection: sqlite3.Connection, excess: int) -> int:
+        """Delete the least recently used entries holding at least ``excess`` bytes."""
+        victims, freed = [], 0
+        for rowid, size in connection.execute("SELECT rowid, size FROM entries ORDER BY accessed").fetchmany(_EVICTION_SCAN):
+            victims.append((rowid,))
+            freed += size
+            if freed >= excess:
+                break
+        connection.executemany("DELETE FROM entries WHERE rowid = ?", victims)
+        return len(victims)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key``, computing and storing it on a miss.
+
+        Concurrent misses on the same key, in this or other processes, may
+        each compute the value.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove ``key``; returns whether it was present."""
+        try:
+            connection = self._connection()
+            with _transaction(connection):
+                return connection.execute("DELETE FROM entries WHERE key = ?", (key,)).rowcount > 0
+        except sqlite3.Error:
+            self._count(errors=1)
+            return False
+
+    def clear(self) -> None:
+        connection = self._connection()
+        with _transaction(connection):
+            connection.execute("DELETE FROM entries")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return this process's hit/miss/eviction counters and the shared size."""
+        try:
+            connection = self._connection()
+            size = connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            stored = connection.execute("SELECT value FROM meta WHERE name = 'bytes'").fetchone()[0]
+        except sqlite3.Error:
+            size = stored = None
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'path': self.path,
+                'size': size,
+                'bytes': stored,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'errors': self.errors,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
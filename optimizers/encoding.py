@@ -0,0 +1,122 @@
+"""Pluggable JSON encoding for API responses.
+
+Optimize responses echo whole prompts back, so encoding is a noticeable
+share of large requests. ResponseEncoder uses orjson or ujson when one is
+installed and the standard library otherwise; select a backend explicitly
+with ``OPTIMIZER_JSON_ENCODER=orjson|ujson|json``. Strings that repeat in
+every response (tool names, explanations) are encoded once and reused, so
+only the prompts themselves are encoded per request.
+
+All backends produce equivalent JSON with sorted keys, but not the same
+bytes: orjson, for one, writes non-ASCII characters as UTF-8 instead of
+``\\u`` escapes.
+"""
+import json
+import os
+from json.encoder import encode_basestring_ascii
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from .results import AnalysisResult, OptimizationResult
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # ujson is optional
+    ujson = None
+
+BACKENDS = ('orjson', 'ujson', 'json')
+
+# Upper bound on cached encodings of repeated strings
+CONSTANT_CACHE_SIZE = 4096
+
+
+def _json_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+def _json_string(value: str) -> bytes:
+    return encode_basestring_ascii(value).encode('ascii')
+
+
+def _backend_functions(name: str) -> Tuple[Callable[[Any], bytes], Callable[[str], bytes]]:
+    if name == 'orjson':
+        return (lambda obj: orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)), orjson.dumps
+    if name == 'ujson':
+        return ((lambda obj: ujson.dumps(obj, sort_keys=True, escape_forward_slashes=False).encode('utf-8')),
+                (lambda value: ujson.dumps(value, escape_forward_slashes=False).encode('utf-8')))
+    return _json_dumps, _json_string
+
+
+def available_backends() -> Tuple[str, ...]:
+    return tuple(name for name, module in zip(BACKENDS, (orjson, ujson, json)) if module is not None)
+
+
+class ResponseEncoder:
+    """Encodes response payloads to JSON bytes with the fastest available backend.
+
+    Strings the chosen backend rejects (e.g. lone surrogates for orjson)
+    fall back to the standard library encoder.
+    """
+
+    def __init__(self, backend: Optional[str] = None):
+        backend = backend or os.environ.get('OPTIMIZER_JSON_ENCODER') or available_backends()[0]
+        if backend not in available_backends():
+            raise ValueError(f"JSON backend '{backend}' is not available (choose from {', '.join(available_backends())})")
+        self.backend = backend
+        self._dumps, self._string = _backend_functions(backend)
+        self._constants: Dict[str, bytes] = {}
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encode ``obj`` with sorted keys."""
+        try:
+            return self._dumps(obj)
+        except (TypeError, ValueError):
+            return _json_dumps(obj)
+
+    def string(self, value: str) -> bytes:
+        """Encode one string, e.g. a prompt."""
+        try:
+            return self._string(value)
+        except (TypeError, ValueError):
+            return _json_string(value)
+
+    def constant(self, value: str) -> bytes:
+        """Encode a string that recurs across responses, caching the result."""
+        encoded = self._constants.get(value)
+        if encoded is None:
+            encoded = self.string(value)
+            if len(self._constants) < CONSTANT_CACHE_SIZE:
+                self._constants[value] = encoded
+        return encoded
+
+    def preload(self, values: Iterable[str]) -> None:
+        """Encode recurring strings up front."""
+        for value in values:
+            self.constant(value)
+
+    def analysis(self, analysis: AnalysisResult) -> bytes:
+        constant = self.constant
+        return b''.join((
+            b'{"complexity":', constant(analysis.complexity),
+            b',"intent":', constant(analysis.intent),
+            b',"keywords":[', b','.join(map(constant, analysis.keywords)),
+            b'],"language":', constant(analysis.language),
+            b',"length":', str(analysis.length).encode('ascii'), b'}',
+        ))
+
+    def optimize_response(self, result: OptimizationResult, analysis: AnalysisResult, tool_name: str,
+                          original_prompt: Optional[str] = None) -> bytes:
+        """Encode an /api/optimize response; ``original_prompt`` is left out when None."""
+        parts = [
+            b'{"analysis":', self.analysis(analysis),
+            b',"explanations":[', b','.join(map(self.constant, result.explanations)),
+            b'],"optimized_prompt":', self.string(result.optimized_prompt),
+        ]
+        if original_prompt is not None:
+            parts += [b',"original_prompt":', self.string(original_prompt)]
+        parts += [b',"tool":', self.constant(tool_name), b'}']
+        return b''.join(parts)
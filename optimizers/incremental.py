@@ -0,0 +1,194 @@
+"""Incremental prompt analysis for clients that send text edits.
+
+An IncrementalAnalysis keeps the counts that PromptOptimizer.analyze_prompt
+is derived from (word count, whole-word vocabulary terms and intent/language
+substrings) and updates them for each edit by re-scanning only a small
+window around the changed region: everything a match depends on lies within
+a few characters of the match, so counts outside the window cannot change.
+The analysis is then read off the counts and always equals a full
+``analyze_prompt`` of the current text.
+
+Offsets and lengths count Unicode code points, i.e. Python string indices.
+"""
+import threading
+import uuid
+from collections import Counter
+from typing import Iterable, List, Mapping, Optional, Tuple
+
+from .cache import LRUCache
+from .results import AnalysisResult
+from .scanner import INTENT_KEYWORDS, KEYWORD_TERMS, LANGUAGES, TECHNICAL_TERMS, NeedleScanner, PromptScanner
+
+class PromptTooLarge(ValueError):
+    """An edit would make the text longer than the session allows."""
+
+
+# An edit is (offset, number of characters deleted, inserted text)
+Edit = Tuple[int, int, str]
+
+# Intent words and languages, which are matched as plain substrings
+NEEDLES = NeedleScanner([word for _, words in INTENT_KEYWORDS for word in words] + list(LANGUAGES))
+
+
+def _count_word_starts(text: str, start: int, end: int) -> int:
+    """Count whitespace-separated words that begin at an index in [start, end)."""
+    end = min(end, len(text))
+    if start >= end:
+        return 0
+    previous_is_space = start == 0 or text[start - 1].isspace()
+    count = 0
+    for char in text[start:end]:
+        is_space = char.isspace()
+        if previous_is_space and not is_space:
+            count += 1
+        previous_is_space = is_space
+    return count
+
+
+class IncrementalAnalysis:
+    """Prompt analysis that is kept up to date under text edits.
+
+    Per-edit work is proportional to the size of the edit, not the prompt.
+    The one exception is splicing the new text into the stored string, which
+    is a single copy of the prompt.
+    """
+
+    def __init__(self, scanner: PromptScanner, text: str = ''):
+        self.scanner = scanner
+        self.needles = NEEDLES
+        # Characters of context a match can depend on beyond the edited region
+        self._needle_margin = max(map(len, self.needles.needles)) - 1
+        self._term_margin = max(map(len, TECHNICAL_TERMS + KEYWORD_TERMS)) + 1
+        self.text = text
+        self.word_count = _count_word_starts(text, 0, len(text))
+        self.terms = self._terms_in(text, 0, len(text))
+        self.needle_counts = self.needles.counts(text.lower())
+
+    def _terms_in(self, text: str, start: int, end: int) -> Counter:
+        """Count vocabulary terms in text[start:end].
+
+        Matches touching a cut edge of the window are left out, since the
+        characters deciding their word boundaries lie outside it.
+        """
+        window = text[start:end].lower()
+        counts: Counter = Counter()
+        for match in self.scanner.vocabulary.finditer(window):
+            if match.start() == 0 and start > 0:
+                continue
+            if match.end() == len(window) and end < len(text):
+                continue
+            counts[match.group()] += 1
+        return counts
+
+    def apply_edit(self, offset: int, delete: int, insert: str) -> None:
+        """Replace ``delete`` characters at ``offset`` with ``insert``."""
+        old = self.text
+        if not isinstance(insert, str):
+            raise ValueError('insert must be a string')
+        if offset < 0 or delete < 0 or offset + delete > len(old):
+            raise ValueError(f'Edit range {offset}:{offset + delete} is outside the text (length {len(old)})')
+        new = old[:offset] + insert + old[offset + delete:]
+
+        # A word starts where a non-space follows a space, so only starts in the
+        # edited region and at the character right after it can change
+        self.word_count += (_count_word_starts(new, offset, offset + len(insert) + 1)
+                            - _count_word_starts(old, offset, offset + delete + 1))
+
+        margin = self._term_margin
+        start = max(offset - margin, 0)
+        self.terms.update(self._terms_in(new, start, offset + len(insert) + margin))
+        self.terms.subtract(self._terms_in(old, start, offset + delete + margin))
+
+        margin = self._needle_margin
+        start = max(offset - margin, 0)
+        self.needle_counts.update(self.needles.counts(new[start:offset + len(insert) + margin].lower()))
+        self.needle_counts.subtract(self.needles.counts(old[start:offset + delete + margin].lower()))
+
+        self.text = new
+
+    def apply_edits(self, edits: Iterable[Edit], max_length: Optional[int] = None) -> None:
+        """Apply ``edits`` in order; on an invalid edit none of them are applied.
+
+        Raises PromptTooLarge if the text would grow beyond ``max_length``.
+        """
+        snapshot = (self.text, self.word_count, self.terms.copy(), self.needle_counts.copy())
+        try:
+            for offset, delete, insert in edits:
+                self.apply_edit(offset, delete, insert)
+                if max_length is not None and len(self.text) > max_length:
+                    raise PromptTooLarge(f'Prompt too long (max {max_length} characters)')
+        except ValueError:
+            self.text, self.word_count, self.terms, self.needle_counts = snapshot
+            raise
+
+    def analysis(self) -> AnalysisResult:
+        """Return the analysis of the current text, as PromptOptimizer.analyze_prompt would."""
+        scanner = self.scanner
+        technical_count = sum(count for term, count in self.terms.items() if term in scanner.technical_terms)
+        keywords = sorted(term for term, count in self.terms.items()
+                          if count > 0 and term in scanner.keyword_terms)
+        return AnalysisResult(
+            intent=self._intent(),
+            complexity=scanner.complexity_from(self.word_count, technical_count),
+            language=next((lang for lang in LANGUAGES if self.needle_counts[lang] > 0), 'general'),
+            keywords=keywords,
+            length=self.word_count,
+        )
+
+    def _intent(self) -> str:
+        for intent, words in INTENT_KEYWORDS:
+            if any(self.needle_counts[word] > 0 for word in words):
+                return intent
+        return 'general'
+
+
+class AnalysisSessions:
+    """Incremental analysis sessions by id, expiring after ``ttl`` seconds unused."""
+
+    def __init__(self, scanner: PromptScanner, maxsize: int = 1024, ttl: Optional[float] = 3600,
+                 max_length: Optional[int] = None):
+        self.scanner = scanner
+        self.max_length = max_length
+        self._sessions = LRUCache(maxsize, ttl)
+
+    def create(self, text: str) -> Tuple[str, AnalysisResult]:
+        """Start a session for ``text`` and return its id and analysis."""
+        if self.max_length is not None and len(text) > self.max_length:
+            raise PromptTooLarge(f'Prompt too long (max {self.max_length} characters)')
+        session = IncrementalAnalysis(self.scanner, text)
+        session_id = uuid.uuid4().hex
+        self._sessions.set(session_id, (session, threading.Lock()))
+        return session_id, session.analysis()
+
+    def edit(self, session_id: str, edits: Iterable[Edit]) -> Optional[AnalysisResult]:
+        """Apply ``edits`` to a session; returns None for an unknown session."""
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+        session, lock = entry
+        with lock:
+            session.apply_edits(edits, self.max_length)
+            # Re-store the entry so sessions in active use do not expire
+            self._sessions.set(session_id, entry)
+            return session.analysis()
+
+    def delete(self, session_id: str) -> bool:
+        return self._sessions.delete(session_id)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+def parse_edits(data: object) -> List[Edit]:
+    """Validate a JSON list of ``{offset, delete, insert}`` objects."""
+    if not isinstance(data, list):
+        raise ValueError('edits must be a list')
+    edits = []
+    for item in data:
+        if not isinstance(item, Mapping):
+            raise ValueError('Each edit must be an object')
+        offset, delete, insert = item.get('offset'), item.get('delete', 0), item.get('insert', '')
+        if type(offset) is not int or type(delete) is not int or not isinstance(insert, str):
+            raise ValueError('Each edit needs an integer offset, an integer delete and a string insert')
+        edits.append((offset, delete, insert))
+    return edits
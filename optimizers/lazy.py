@@ -0,0 +1,58 @@
+"""Thread-safe lazy construction of service objects, timed for startup profiling.
+
+``app.py`` builds its optimizer, tool registry, encoders and sessions on first
+use instead of at import. A cold start then pays only for what the first
+request needs. Each initializer runs exactly once, even when several
+threads call it at the same time. An initializer that raises is retried on
+the next call.
+
+The first call of each initializer is timed. ``initializer_timings()``
+reports the total time of every initializer and its self time, which
+excludes the other initializers it called.
+"""
+import functools
+import threading
+import time
+from typing import Callable, Dict, List, TypeVar
+
+T = TypeVar('T')
+
+_timings: Dict[str, Dict[str, float]] = {}
+_active = threading.local()
+
+
+def lazy(factory: Callable[[], T]) -> Callable[[], T]:
+    """Turn a zero-argument factory into a getter that builds its value once."""
+    lock = threading.Lock()
+    instance: List[T] = []
+
+    @functools.wraps(factory)
+    def get() -> T:
+        if not instance:
+            with lock:
+                if not instance:
+                    instance.append(_timed(factory))
+        return instance[0]
+
+    get.initialized = lambda: bool(instance)
+    return get
+
+
+def _timed(factory: Callable[[], T]) -> T:
+    stack = _active.__dict__.setdefault('stack', [])
+    stack.append(0.0)  # time spent in nested initializers
+    start = time.perf_counter()
+    try:
+        value = factory()
+    finally:
+        elapsed = time.perf_counter() - start
+        nested = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+    _timings[factory.__name__] = {'total': elapsed, 'self': elapsed - nested}
+    return value
+
+
+def initializer_timings() -> Dict[str, Dict[str, float]]:
+    """Seconds spent in each initializer that has run, in the order they finished."""
+    return {name: dict(timing) for name, timing in _timings.items()}
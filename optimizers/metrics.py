@@ -0,0 +1,130 @@
+"""In-process request metrics rendered in the Prometheus text format.
+
+Stage durations go into fixed-bucket histograms and requests/errors into
+labelled counters; nothing is sent to external services. A disabled
+Metrics object hands out one shared no-op timer, so instrumented code pays
+only for a method call when metrics are off.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+# Upper bounds in seconds, from 50us to 2.5s
+DEFAULT_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                   0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class Histogram:
+    """Cumulative-bucket histogram of durations in seconds."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> Iterator[Tuple[str, int]]:
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            yield ('+Inf' if bound == float('inf') else repr(bound)), total
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def _labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ''
+    pairs = (
+        '{}="{}"'.format(key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in labels
+    )
+    return '{' + ','.join(pairs) + '}'
+
+
+class Metrics:
+    """Thread-safe registry of stage histograms and labelled counters."""
+
+    def __init__(self, enabled: bool = True, prefix: str = 'optimizer'):
+        self.enabled = enabled
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Histogram] = {}
+        self._counters: Dict[str, Dict[Tuple[Tuple[str, str], ...], int]] = {}
+        self._help: Dict[str, str] = {}
+
+    def stage(self, name: str):
+        """Context manager recording the duration of the enclosed block as stage ``name``."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def observe(self, stage: str, seconds: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = Histogram()
+            histogram.observe(seconds)
+
+    def inc(self, name: str, help_text: str = '', **labels: str) -> None:
+        """Increment counter ``name`` for the given label values."""
+        if not self.enabled:
+            return
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + 1
+            if help_text:
+                self._help.setdefault(name, help_text)
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            if self._stages:
+                name = f'{self.prefix}_stage_duration_seconds'
+                lines.append(f'# HELP {name} Time spent in each request stage.')
+                lines.append(f'# TYPE {name} histogram')
+                for stage, histogram in sorted(self._stages.items()):
+                    for bound, count in histogram.cumulative():
+                        lines.append(f'{name}_bucket{_labels((("stage", stage), ("le", bound)))} {count}')
+                    lines.append(f'{name}_sum{_labels((("stage", stage),))} {histogram.sum!r}')
+                    lines.append(f'{name}_count{_labels((("stage", stage),))} {histogram.count}')
+            for counter, series in sorted(self._counters.items()):
+                name = f'{self.prefix}_{counter}'
+                if counter in self._help:
+                    lines.append(f'# HELP {name} {self._help[counter]}')
+                lines.append(f'# TYPE {name} counter')
+                for labels, value in sorted(series.items()):
+                    lines.append(f'{name}{_labels(labels)} {value}')
+        return '\n'.join(lines) + '\n' if lines else ''
+
+
+# Shared disabled instance for code that is instrumented but not configured
+NULL_METRICS = Metrics(enabled=False)
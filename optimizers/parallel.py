@@ -0,0 +1,109 @@
+"""Process-pool execution for bulk optimization.
+
+Prompt analysis and regex rewriting are pure-Python CPU work, so a single
+process is limited to one core. ``optimize_many`` spreads prompts over a
+pool of worker processes; each worker builds its optimizer once in the pool
+initializer, tasks are shipped in chunks, and results come back in input
+order with only a bounded number of chunks in flight.
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .advanced_optimizer import AdvancedPromptOptimizer
+from .cache import LRUCache
+from .prompt_optimizer import PromptOptimizer
+
+# A task is (prompt, tool ids, context)
+Task = Tuple[str, List[str], Optional[Dict]]
+
+# Tool ids both engines accept. The advanced engine only has rules for some
+# of them, so like /api/optimize/advanced it checks against the basic tools.
+TOOL_IDS = frozenset(PromptOptimizer().tools)
+
+_worker_optimizer = None
+_worker_engine = None
+
+
+def make_optimizer(engine: str = 'basic', cache_size: int = 0) -> Union[PromptOptimizer, AdvancedPromptOptimizer]:
+    cache = LRUCache(cache_size) if cache_size > 0 else None
+    if engine == 'advanced':
+        return AdvancedPromptOptimizer(cache=cache)
+    return PromptOptimizer(cache=cache)
+
+
+def optimize_one(optimizer, engine: str, prompt: str, tools: List[str], context: Optional[Dict] = None) -> List[Dict]:
+    """Optimize one prompt for each tool and return one result dict per tool."""
+    results = []
+    if not tools:
+        return results
+    if engine == 'advanced':
+        for tool_id in tools:
+            if tool_id not in TOOL_IDS:
+                results.append({'tool': tool_id, 'error': 'Tool not found'})
+                continue
+            result = optimizer.optimize_prompt(prompt, tool_id, context)
+            results.append(dict(tool=tool_id, **result.to_dict()))
+        return results
+
+    analysis = optimizer.analyze_prompt(prompt)
+    analysis_dict = analysis.to_dict()
+    for tool_id in tools:
+        if tool_id not in optimizer.tools:
+            results.append({'tool': tool_id, 'error': 'Tool not found'})
+            continue
+        result = optimizer.optimize_for_tool(prompt, tool_id, analysis)
+        results.append(dict(tool=tool_id, **result.to_dict(), analysis=analysis_dict))
+    return results
+
+
+def _init_worker(engine: str, cache_size: int) -> None:
+    global _worker_optimizer, _worker_engine
+    _worker_optimizer = make_optimizer(engine, cache_size)
+    _worker_engine = engine
+
+
+def _run_chunk(chunk: List[Task]) -> List[List[Dict]]:
+    return [optimize_one(_worker_optimizer, _worker_engine, *task) for task in chunk]
+
+
+def run_tasks(tasks: Iterable[Task], engine: str = 'basic', workers: Optional[int] = None,
+              chunksize: int = 64, cache_size: int = 0) -> Iterator[List[Dict]]:
+    """Yield the results of each task in input order.
+
+    ``workers`` defaults to the CPU count; with one worker the tasks run in
+    this process. At most ``2 * workers`` chunks are pending at a time, so
+    ``tasks`` may be an unbounded stream.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        optimizer = make_optimizer(engine, cache_size)
+        for task in tasks:
+            yield optimize_one(optimizer, engine, *task)
+        return
+
+    tasks = iter(tasks)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(engine, cache_size)) as executor:
+        pending = deque()
+        while True:
+            while len(pending) < 2 * workers:
+                chunk = list(islice(tasks, chunksize))
+                if not chunk:
+                    break
+                pending.append(executor.submit(_run_chunk, chunk))
+            if not pending:
+                break
+            yield from pending.popleft().result()
+
+
+def optimize_many(prompts: Iterable[str], tools: List[str], workers: Optional[int] = None,
+                  chunksize: int = 64, engine: str = 'basic', context: Optional[Dict] = None) -> Iterator[List[Dict]]:
+    """Optimize every prompt for every tool across a process pool.
+
+    Yields, for each prompt in order, the list of per-tool results.
+    """
+    tools = list(tools)
+    return run_tasks(((prompt, tools, context) for prompt in prompts), engine, workers, chunksize)
@@ -0,0 +1,45 @@
+"""Single-pass pipeline combining the basic and advanced optimizers.
+
+Running PromptOptimizer.analyze_prompt and optimize_for_tool, then
+AdvancedPromptOptimizer.optimize_prompt, analyze_prompt_quality and
+suggest_improvements one after another lowercases and splits the same
+prompt in every stage. The pipeline builds one PromptText for the prompt
+and hands it to intent detection, rule conditions, the general
+improvements and the quality metrics. Each stage gives exactly the result
+it gives when called on its own, and both optimizers' result caches are
+used as usual.
+"""
+from typing import Dict, Optional
+
+from .advanced_optimizer import AdvancedPromptOptimizer
+from .prompt_optimizer import PromptOptimizer
+from .results import PipelineResult
+from .rules import RuleBudget
+from .scanner import PromptText
+
+
+class OptimizationPipeline:
+    """Basic analysis and rewrite, advanced rewrite, quality scores and suggestions in one call."""
+
+    def __init__(self, basic: PromptOptimizer, advanced: AdvancedPromptOptimizer):
+        self.basic = basic
+        self.advanced = advanced
+
+    def run(self, prompt: str, tool_id: str, context: Optional[Dict] = None,
+            budget: Optional[RuleBudget] = None) -> PipelineResult:
+        """Run every stage on ``prompt`` for ``tool_id``.
+
+        Rules skipped because of the ``budget`` are listed in the result.
+        """
+        text = PromptText(prompt)
+        metrics = self.basic.metrics
+        with metrics.stage('analyze_prompt'):
+            analysis = self.basic.scanner.scan_text(text)
+        basic = self.basic.optimize_for_tool(prompt, tool_id, analysis)
+        with metrics.stage('advanced_rules'):
+            advanced = self.advanced.optimize_prompt(prompt, tool_id, context, budget, text)
+        with metrics.stage('quality'):
+            quality = self.advanced.quality_scorer.score_text(text)
+            suggestions = self.advanced.suggest_improvements(prompt, quality)
+        return PipelineResult(analysis, basic, advanced, quality, suggestions,
+                              budget.skipped if budget is not None else ())
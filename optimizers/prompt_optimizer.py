@@ -0,0 +1,258 @@
+import hashlib
+import json
+from typing import Dict, List, Optional, Tuple
+
+from .cache import LRUCache, make_key
+from .metrics import NULL_METRICS, Metrics
+from .results import AnalysisResult, OptimizationResult
+from .scanner import LANGUAGES, PromptScanner
+
+# Version of the rewrite and explanation logic in this module. Bump it whenever
+# a change alters the results for the same prompt, tool and tool definitions,
+# so persistent caches drop the results of the old code.
+RESULTS_VERSION = 1
+
+
+class PromptOptimizer:
+    def __init__(self, cache: Optional[LRUCache] = None, metrics: Optional[Metrics] = None):
+        self.scanner = PromptScanner()
+        self.cache = cache
+        self.metrics = metrics or NULL_METRICS
+        # Explanation strings that only depend on the tool or the language,
+        # built once and shared by every result
+        self._tool_explanations: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+        self._language_explanations: Dict[str, str] = {}
+        self.tools = {
+            'copilot': {
+                'name': 'GitHub Copilot',
+                'strengths': ['code completion', 'context awareness', 'multi-language support'],
+                'preferences': ['clear function signatures', 'descriptive variable names', 'inline comments'],
+                'optimization_strategies': [
+                    'Add specific type hints and function signatures',
+                    'Include clear variable names and context',
+                    'Break complex requests into smaller, focused tasks',
+                    'Use descriptive comments to guide code generation'
+                ]
+            },
+            'cursor': {
+                'name': 'Cursor AI',
+                'strengths': ['code editing', 'refactoring', 'debugging'],
+                'preferences': ['specific edit instructions', 'clear before/after examples', 'focused scope'],
+                'optimization_strategies': [
+                    'Specify exact locations for code changes',
+                    'Provide clear before/after examples',
+                    'Use precise action verbs (refactor, optimize, fix)',
+                    'Include relevant file context and imports'
+                ]
+            },
+            'replit': {
+                'name': 'Replit AI',
+                'strengths': ['rapid prototyping', 'educational code', 'web development'],
+                'preferences': ['step-by-step instructions', 'beginner-friendly explanations', 'complete examples'],
+                'optimization_strategies': [
+                    'Break down complex tasks into learning steps',
+                    'Request complete, runnable examples',
+                    'Ask for explanations alongside code',
+                    'Specify the target skill level (beginner/intermediate/advanced)'
+                ]
+            },
+            'codewhisperer': {
+                'name': 'Amazon CodeWhisperer',
+                'strengths': ['AWS integration', 'security best practices', 'enterprise patterns'],
+                'preferences': ['AWS service context', 'security considerations', 'scalable patterns'],
+                'optimization_strategies': [
+                    'Mention relevant AWS services and integrations',
+                    'Include security and compliance requirements',
+                    'Request scalable and maintainable solutions',
+                    'Specify deployment and infrastructure context'
+                ]
+            },
+            'tabnine': {
+                'name': 'Tabnine',
+                'strengths': ['local context', 'team patterns', 'code consistency'],
+                'preferences': ['consistent coding style', 'team conventions', 'local codebase patterns'],
+                'optimization_strategies': [
+                    'Reference existing code patterns in your project',
+                    'Mention team coding standards and conventions',
+                    'Request consistency with existing codebase style',
+                    'Include relevant file and class context'
+                ]
+            },
+            'codium': {
+                'name': 'Codium AI',
+                'strengths': ['test generation', 'code analysis', 'quality assurance'],
+                'preferences': ['test scenarios', 'edge cases', 'code quality metrics'],
+                'optimization_strategies': [
+                    'Request comprehensive test coverage',
+                    'Specify edge cases and error scenarios',
+                    'Ask for code quality improvements',
+                    'Include performance and maintainability considerations'
+                ]
+            }
+        }
+        # Tool-specific rewrites, looked up by tool id; tools without one are left as they are
+        self._tool_optimizers = {
+            'copilot': self._optimize_copilot,
+            'cursor': self._optimize_cursor,
+            'replit': self._optimize_replit,
+            'codewhisperer': self._optimize_codewhisperer,
+            'tabnine': self._optimize_tabnine,
+            'codium': self._optimize_codium,
+        }
+        # Identifies the tool definitions and rewrite logic results are computed
+        # from; part of every cache key, so persistent caches never serve old results
+        self.profile_version = hashlib.sha256(
+            json.dumps([RESULTS_VERSION, self.tools], sort_keys=True).encode('utf-8')
+        ).hexdigest()
+    
+    def analyze_prompt(self, prompt: str) -> AnalysisResult:
+        """Analyze the input prompt to understand intent and complexity."""
+        with self.metrics.stage('analyze_prompt'):
+            return self.scanner.scan(prompt)
+    
+    def _detect_intent(self, prompt: str) -> str:
+        """Detect the primary intent of the prompt."""
+        return self.scanner.scan(prompt).intent
+    
+    def _assess_complexity(self, prompt: str) -> str:
+        """Assess the complexity level of the prompt."""
+        return self.scanner.scan(prompt).complexity
+    
+    def _detect_language(self, prompt: str) -> str:
+        """Detect programming language mentioned in the prompt."""
+        return self.scanner.scan(prompt).language
+    
+    def _extract_keywords(self, prompt: str) -> List[str]:
+        """Extract important keywords from the prompt."""
+        return list(self.scanner.scan(prompt).keywords)
+    
+    def optimize_for_tool(self, prompt: str, tool_id: str,
+                          analysis: Optional[AnalysisResult] = None) -> OptimizationResult:
+        """Optimize the prompt for a specific tool.
+
+        A precomputed ``analysis`` of the same prompt (an AnalysisResult or a
+        dict of the same shape) can be passed in to avoid analyzing it again
+        (e.g. when fanning one prompt out to several tools). The result unpacks as ``(optimized_prompt, explanations)``.
+        """
+        if tool_id not in self.tools:
+            return OptimizationResult(prompt, ("Tool not found",))
+        
+        if self.cache is None:
+            return self._optimize(prompt, tool_id, analysis)
+        
+        # Results are immutable, so cached ones are returned as they are
+        return self.cache.get_or_compute(
+            make_key(prompt, tool_id, version=self.profile_version),
+            lambda: self._optimize(prompt, tool_id, analysis)
+        )
+    
+    def _optimize(self, prompt: str, tool_id: str, analysis: Optional[AnalysisResult]) -> OptimizationResult:
+        tool = self.tools[tool_id]
+        if analysis is None:
+            analysis = self.analyze_prompt(prompt)
+        elif isinstance(analysis, dict):
+            analysis = AnalysisResult(**analysis)
+        
+        with self.metrics.stage('apply_optimizations'):
+            optimized_prompt = self._apply_optimizations(prompt, tool_id, analysis)
+        with self.metrics.stage('generate_explanations'):
+            explanations = self._generate_explanations(prompt, optimized_prompt, tool, analysis)
+        
+        return OptimizationResult(optimized_prompt, explanations)
+    
+    def _apply_optimizations(self, prompt: str, tool_id: str, analysis: AnalysisResult) -> str:
+        """Apply tool-specific optimizations to the prompt."""
+        optimize = self._tool_optimizers.get(tool_id)
+        return optimize(prompt, analysis) if optimize is not None else prompt
+    
+    def _optimize_copilot(self, prompt: str, analysis: AnalysisResult) -> str:
+        optimized = prompt
+        if analysis.intent == 'creation' and analysis.language != 'general':
+            optimized = f"In {analysis.language}, {optimized}"
+        if 'function' in analysis.keywords:
+            optimized += "\n\nPlease include type hints and clear parameter names."
+        return optimized
+    
+    def _optimize_cursor(self, prompt: str, analysis: AnalysisResult) -> str:
+        if analysis.intent == 'refactoring':
+            return f"Please refactor the following code: {prompt}\n\nProvide the complete updated code with clear explanations of changes made."
+        if analysis.intent == 'debugging':
+            return f"Debug this code issue: {prompt}\n\nPlease identify the problem and provide the corrected code."
+        return prompt
+    
+    def _optimize_replit(self, prompt: str, analysis: AnalysisResult) -> str:
+        optimized = prompt
+        if analysis.complexity == 'complex':
+            optimized = f"Break this down step by step: {optimized}\n\nPlease provide a complete, runnable example with explanations."
+        return optimized + "\n\nMake sure the code is beginner-friendly and well-commented."
+    
+    def _optimize_codewhisperer(self, prompt: str, analysis: AnalysisResult) -> str:
+        optimized = prompt
+        if 'api' in analysis.keywords or 'server' in analysis.keywords:
+            optimized += "\n\nPlease consider AWS best practices and security implications."
+        if analysis.intent == 'creation':
+            optimized += "\n\nInclude error handling and scalability considerations."
+        return optimized
+    
+    def _optimize_tabnine(self, prompt: str, analysis: AnalysisResult) -> str:
+        return f"Following our team's coding standards: {prompt}\n\nPlease maintain consistency with existing codebase patterns."
+    
+    def _optimize_codium(self, prompt: str, analysis: AnalysisResult) -> str:
+        optimized = prompt
+        if analysis.intent != 'testing':
+            optimized += "\n\nAlso generate comprehensive unit tests for this code."
+        return optimized + "\n\nInclude edge cases and error scenarios in the tests."
+    
+    def _generate_explanations(self, original: str, optimized: str, tool: Dict,
+                               analysis: AnalysisResult) -> List[str]:
+        """Generate explanations for the optimizations made."""
+        explanations = []
+        added_context, strength_explanations = self._explanations_for(tool)
+        
+        if len(optimized) > len(original):
+            explanations.append(added_context)
+        
+        language = analysis.language
+        if language != 'general':
+            explanation = self._language_explanations.get(language)
+            if explanation is None:
+                explanation = self._language_explanations[language] = \
+                    f"Specified programming language ({language}) for better context"
+            explanations.append(explanation)
+        
+        if analysis.intent == 'creation':
+            explanations.append("Enhanced prompt for code creation with specific requirements")
+        elif analysis.intent == 'debugging':
+            explanations.append("Structured prompt for effective debugging assistance")
+        elif analysis.intent == 'refactoring':
+            explanations.append("Optimized for code improvement and refactoring guidance")
+        
+        explanations.extend(strength_explanations)
+        
+        return explanations
+    
+    def explanation_strings(self) -> List[str]:
+        """Every explanation that depends only on the tool, language or intent.
+
+        Used to pre-encode the recurring parts of responses.
+        """
+        strings = [
+            "Enhanced prompt for code creation with specific requirements",
+            "Structured prompt for effective debugging assistance",
+            "Optimized for code improvement and refactoring guidance",
+        ]
+        for tool in self.tools.values():
+            added_context, strength_explanations = self._explanations_for(tool)
+            strings.append(added_context)
+            strings.extend(strength_explanations)
+        strings.extend(f"Specified programming language ({language}) for better context" for language in LANGUAGES)
+        return strings
+    
+    def _explanations_for(self, tool: Dict) -> Tuple[str, Tuple[str, ...]]:
+        cached = self._tool_explanations.get(tool['name'])
+        if cached is None:
+            cached = self._tool_explanations[tool['name']] = (
+                f"Added context and specifications optimized for {tool['name']}'s strengths",
+                tuple(f"Leveraged {tool['name']}'s strength in {strength}" for strength in tool['strengths'][:2])
+            )
+        return cached
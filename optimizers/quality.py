@@ -0,0 +1,117 @@
+"""Prompt quality scoring over whole batches of prompts.
+
+The quality metrics of AdvancedPromptOptimizer only depend on which terms
+occur in a prompt, its word count and its average sentence length. The batch
+scorer computes those once per prompt into a shared term-presence matrix and
+derives all four metrics column-wise, using NumPy when it is installed and
+plain Python otherwise. Results are identical to the per-prompt methods.
+"""
+from typing import List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+from .results import QualityMetrics
+from .scanner import PromptText
+
+SPECIFIC_WORDS = ('function', 'class', 'method', 'variable', 'parameter', 'return', 'input', 'output')
+
+COMPLETENESS_INDICATORS = ('input', 'output', 'example', 'requirement', 'constraint',
+                           'error', 'handle', 'test', 'validate')
+
+TECHNICAL_TERMS = ('algorithm', 'data structure', 'complexity', 'performance',
+                   'optimization', 'pattern', 'architecture', 'framework',
+                   'library', 'api', 'database', 'async', 'concurrent')
+
+# Number of technical terms needed for a full technical_depth score
+TECHNICAL_TERMS_FOR_FULL_SCORE = 5
+
+
+def average_sentence_length(prompt: str, word_count: Optional[int] = None) -> float:
+    """Average number of words per '.'-separated sentence.
+
+    Counting the words of the whole prompt with '.' treated as whitespace
+    gives the same total as splitting every sentence, without building the
+    sentence list. Without any '.', that total is the prompt's word count,
+    so a known ``word_count`` is used as is.
+    """
+    if word_count is not None and '.' not in prompt:
+        return word_count / 1
+    return len(prompt.replace('.', ' ').split()) / (prompt.count('.') + 1)
+
+
+class QualityScorer:
+    """Scores specificity, clarity, completeness and technical depth for many prompts."""
+
+    def __init__(self, use_numpy: bool = True):
+        self.terms = tuple(dict.fromkeys(SPECIFIC_WORDS + COMPLETENESS_INDICATORS + TECHNICAL_TERMS))
+        column = {term: index for index, term in enumerate(self.terms)}
+        self._specific = [column[term] for term in SPECIFIC_WORDS]
+        self._completeness = [column[term] for term in COMPLETENESS_INDICATORS]
+        self._technical = [column[term] for term in TECHNICAL_TERMS]
+        self.use_numpy = use_numpy and np is not None
+
+    def score_text(self, text: PromptText) -> QualityMetrics:
+        """Score one prompt from its shared lowercased text and word count."""
+        prompt_lower, word_count = text.lower, text.word_count
+        specific_count = sum(1 for word in SPECIFIC_WORDS if word in prompt_lower)
+        clarity = 1.0 - abs(average_sentence_length(text.text, word_count) - 17.5) / 17.5
+        completeness = sum(1 for indicator in COMPLETENESS_INDICATORS if indicator in prompt_lower)
+        technical = sum(1 for term in TECHNICAL_TERMS if term in prompt_lower)
+        return QualityMetrics(
+            specificity=min(specific_count / (word_count * 0.1), 1.0) if word_count else 0.0,
+            clarity=max(0.0, min(clarity, 1.0)),
+            completeness=min(completeness / len(COMPLETENESS_INDICATORS), 1.0),
+            technical_depth=min(technical / TECHNICAL_TERMS_FOR_FULL_SCORE, 1.0)
+        )
+
+    def term_matrix(self, prompts: Sequence[str]) -> List[List[int]]:
+        """Return a prompts x terms matrix with 1 where the term occurs in the prompt."""
+        terms = self.terms
+        matrix = []
+        for prompt in prompts:
+            prompt_lower = prompt.lower()
+            matrix.append([1 if term in prompt_lower else 0 for term in terms])
+        return matrix
+
+    def score(self, prompts: Sequence[str]) -> List[QualityMetrics]:
+        """Return the quality metrics of every prompt, in order."""
+        if not prompts:
+            return []
+        matrix = self.term_matrix(prompts)
+        word_counts = [len(prompt.split()) for prompt in prompts]
+        sentence_lengths = [average_sentence_length(prompt) for prompt in prompts]
+        if self.use_numpy:
+            columns = self._score_numpy(matrix, word_counts, sentence_lengths)
+        else:
+            columns = self._score_python(matrix, word_counts, sentence_lengths)
+        return [QualityMetrics(*values) for values in zip(*columns)]
+
+    def _score_python(self, matrix, word_counts, sentence_lengths):
+        specificity, clarity, completeness, technical_depth = [], [], [], []
+        for row, word_count, sentence_length in zip(matrix, word_counts, sentence_lengths):
+            specific_count = sum(map(row.__getitem__, self._specific))
+            specificity.append(min(specific_count / (word_count * 0.1), 1.0) if word_count else 0.0)
+            clarity_score = 1.0 - abs(sentence_length - 17.5) / 17.5
+            clarity.append(max(0.0, min(clarity_score, 1.0)))
+            present = sum(map(row.__getitem__, self._completeness))
+            completeness.append(min(present / len(COMPLETENESS_INDICATORS), 1.0))
+            present = sum(map(row.__getitem__, self._technical))
+            technical_depth.append(min(present / TECHNICAL_TERMS_FOR_FULL_SCORE, 1.0))
+        return specificity, clarity, completeness, technical_depth
+
+    def _score_numpy(self, matrix, word_counts, sentence_lengths):
+        presence = np.array(matrix, dtype=np.int64)
+        word_counts = np.array(word_counts, dtype=np.int64)
+        sentence_lengths = np.array(sentence_lengths, dtype=np.float64)
+
+        specific_counts = presence[:, self._specific].sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            specificity = np.minimum(specific_counts / (word_counts * 0.1), 1.0)
+        specificity = np.where(word_counts == 0, 0.0, specificity)
+        clarity = np.clip(1.0 - np.abs(sentence_lengths - 17.5) / 17.5, 0.0, 1.0)
+        completeness = np.minimum(presence[:, self._completeness].sum(axis=1) / len(COMPLETENESS_INDICATORS), 1.0)
+        technical_depth = np.minimum(presence[:, self._technical].sum(axis=1) / TECHNICAL_TERMS_FOR_FULL_SCORE, 1.0)
+        return tuple(column.tolist() for column in (specificity, clarity, completeness, technical_depth))
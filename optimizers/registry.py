@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import string
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Iterator, Mapping, Optional, Tuple
+
+TOOL_ANALYSIS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tool_analysis.json')
+
+LIST_FIELDS = ('strengths', 'weaknesses', 'best_practices', 'optimization_techniques')
+
+
+class PromptPattern:
+    """A prompt template from tool_analysis.json, parsed once into literal and slot segments."""
+
+    __slots__ = ('name', 'template', 'fields', '_segments')
+
+    def __init__(self, name: str, template: str):
+        self.name = name
+        self.template = template
+        segments = []
+        for literal, field, format_spec, conversion in string.Formatter().parse(template):
+            if format_spec or conversion:
+                raise ValueError(f"Prompt pattern '{name}' uses an unsupported format spec")
+            segments.append((literal, field))
+        self._segments: Tuple[Tuple[str, Optional[str]], ...] = tuple(segments)
+        self.fields: Tuple[str, ...] = tuple(dict.fromkeys(field for _, field in segments if field))
+
+    def render(self, values: Mapping[str, str]) -> str:
+        """Fill the template; slots without a value keep their ``{placeholder}``."""
+        return ''.join(literal + (values.get(field) or '{' + field + '}') if field else literal
+                       for literal, field in self._segments)
+
+    def missing(self, values: Mapping[str, str]) -> Tuple[str, ...]:
+        """The slots ``render`` would leave as placeholders."""
+        return tuple(field for field in self.fields if not values.get(field))
+
+    def __repr__(self) -> str:
+        return f"PromptPattern({self.name!r}, fields={self.fields!r})"
+
+
+@dataclass(frozen=True)
+class ToolProfile:
+    """Immutable profile of one AI coding tool."""
+    id: str
+    name: str
+    description: str
+    strengths: Tuple[str, ...]
+    weaknesses: Tuple[str, ...]
+    best_practices: Tuple[str, ...]
+    optimization_techniques: Tuple[str, ...]
+    prompt_patterns: Mapping[str, PromptPattern]
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'description': self.description,
+            'strengths': list(self.strengths),
+            'weaknesses': list(self.weaknesses),
+            'best_practices': list(self.best_practices),
+            'optimization_techniques': list(self.optimization_techniques),
+            'prompt_patterns': {name: pattern.template for name, pattern in self.prompt_patterns.items()},
+        }
+
+
+def _string_list(tool_id: str, field: str, value) -> Tuple[str, ...]:
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f"Tool '{tool_id}': '{field}' must be a list of strings")
+    return tuple(value)
+
+
+def _profile_from_dict(tool_id: str, data: Mapping) -> ToolProfile:
+    if not isinstance(data, dict):
+        raise ValueError(f"Tool '{tool_id}' must be an object")
+    for field in ('name', 'description'):
+        if not isinstance(data.get(field), str) or not data[field]:
+            raise ValueError(f"Tool '{tool_id}': '{field}' must be a non-empty string")
+    patterns = data.get('prompt_patterns', {})
+    if not isinstance(patterns, dict) or not all(isinstance(t, str) for t in patterns.values()):
+        raise ValueError(f"Tool '{tool_id}': 'prompt_patterns' must map names to template strings")
+
+    return ToolProfile(
+        id=tool_id,
+        name=data['name'],
+        description=data['description'],
+        prompt_patterns=MappingProxyType({
+            name: PromptPattern(name, template) for name, template in patterns.items()
+        }),
+        **{field: _string_list(tool_id, field, data.get(field, [])) for field in LIST_FIELDS}
+    )
+
+
+class ToolRegistry:
+    """Validated, read-only tool profiles loaded from tool_analysis.json."""
+
+    def __init__(self, data: Mapping, version: str = ''):
+        tools = data.get('tools') if isinstance(data, dict) else None
+        if not isinstance(tools, dict) or not tools:
+            raise ValueError("Tool analysis must contain a non-empty 'tools' object")
+        self._profiles: Mapping[str, ToolProfile] = MappingProxyType({
+            tool_id: _profile_from_dict(tool_id, profile) for tool_id, profile in tools.items()
+        })
+        self.version = version
+
+    @classmethod
+    def load(cls, path: str = TOOL_ANALYSIS_PATH) -> 'ToolRegistry':
+        """Load and validate a tool analysis file; ``version`` is its content hash."""
+        with open(path, 'rb') as f:
+            raw = f.read()
+        return cls(json.loads(raw), version=hashlib.sha256(raw).hexdigest())
+
+    def __contains__(self, tool_id: str) -> bool:
+        return tool_id in self._profiles
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._profiles)
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def __getitem__(self, tool_id: str) -> ToolProfile:
+        return self._profiles[tool_id]
+
+    def get(self, tool_id: str) -> Optional[ToolProfile]:
+        return self._profiles.get(tool_id)
@@ -0,0 +1,189 @@
+"""Compact result types returned by the optimizers.
+
+Analyses, optimizations and quality metrics are created for every request,
+so they are slotted objects rather than dicts: no per-instance dict, and
+sequences are stored as tuples. Intent, complexity and language are always
+one of the shared constant strings from the scanner, so results reference
+them instead of holding copies, and their JSON encodings are cached.
+
+Results are shared (e.g. by the result cache) and must not be modified.
+For code written against the old dict results, fields can still be read as
+``result['intent']`` and ``to_dict()`` gives the exact dict served over HTTP.
+``to_json()`` renders the same JSON (sorted keys, compact separators) without
+building the dict first.
+"""
+import json
+from json.encoder import encode_basestring_ascii
+from typing import Dict, Iterator, Mapping, Sequence, Tuple
+
+# JSON encodings of the enum-like strings (intents, languages, keywords, ...),
+# bounded in case results are built from arbitrary strings
+_ENCODED: Dict[str, str] = {}
+_ENCODED_LIMIT = 4096
+
+
+def _encode_constant(value: str) -> str:
+    encoded = _ENCODED.get(value)
+    if encoded is None:
+        encoded = encode_basestring_ascii(value)
+        if len(_ENCODED) < _ENCODED_LIMIT:
+            _ENCODED[value] = encoded
+    return encoded
+
+
+class _Result:
+    """Dict-style read access and equality shared by the result types."""
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.__slots__
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, _Result):
+            return type(self) is type(other) and self.to_dict() == other.to_dict()
+        if isinstance(other, Mapping):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)
+        return f'{type(self).__name__}({fields})'
+
+
+class AnalysisResult(_Result):
+    """Intent, complexity, language, keywords and word count of a prompt."""
+
+    __slots__ = ('intent', 'complexity', 'language', 'keywords', 'length')
+
+    def __init__(self, intent: str, complexity: str, language: str, keywords: Sequence[str], length: int):
+        self.intent = intent
+        self.complexity = complexity
+        self.language = language
+        self.keywords = tuple(keywords)
+        self.length = length
+
+    def to_dict(self) -> Dict:
+        return {
+            'intent': self.intent,
+            'complexity': self.complexity,
+            'language': self.language,
+            'keywords': list(self.keywords),
+            'length': self.length
+        }
+
+    def to_json(self) -> str:
+        keywords = ','.join(map(_encode_constant, self.keywords))
+        return (f'{{"complexity":{_encode_constant(self.complexity)},"intent":{_encode_constant(self.intent)},'
+                f'"keywords":[{keywords}],"language":{_encode_constant(self.language)},"length":{self.length:d}}}')
+
+
+class OptimizationResult(_Result):
+    """An optimized prompt and the explanations of what was changed.
+
+    Behaves like the ``(optimized_prompt, explanations)`` tuple returned
+    before, so unpacking, indexing and comparing with such tuples keep
+    working.
+    """
+
+    __slots__ = ('optimized_prompt', 'explanations')
+
+    def __init__(self, optimized_prompt: str, explanations: Sequence[str]):
+        self.optimized_prompt = optimized_prompt
+        self.explanations = tuple(explanations)
+
+    def __iter__(self) -> Iterator:
+        yield self.optimized_prompt
+        yield self.explanations
+
+    def __len__(self) -> int:
+        return 2
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return super().__getitem__(key)
+        return (self.optimized_prompt, self.explanations)[key]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, tuple):
+            return len(other) == 2 and other[0] == self.optimized_prompt and list(other[1]) == list(self.explanations)
+        return super().__eq__(other)
+
+    __hash__ = None
+
+    def to_dict(self) -> Dict:
+        return {'optimized_prompt': self.optimized_prompt, 'explanations': list(self.explanations)}
+
+    def to_json(self) -> str:
+        explanations = ','.join(map(encode_basestring_ascii, self.explanations))
+        return f'{{"explanations":[{explanations}],"optimized_prompt":{encode_basestring_ascii(self.optimized_prompt)}}}'
+
+
+class QualityMetrics(_Result):
+    """Prompt quality scores, each between 0 and 1."""
+
+    __slots__ = ('specificity', 'clarity', 'completeness', 'technical_depth')
+
+    def __init__(self, specificity: float, clarity: float, completeness: float, technical_depth: float):
+        self.specificity = specificity
+        self.clarity = clarity
+        self.completeness = completeness
+        self.technical_depth = technical_depth
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), sort_keys=True, separators=(',', ':'))
+
+
+class TemplateResult(_Result):
+    """A prompt rendered from one of a tool's prompt patterns."""
+
+    __slots__ = ('template', 'prompt', 'missing')
+
+    def __init__(self, template: str, prompt: str, missing: Sequence[str]):
+        self.template = template
+        self.prompt = prompt
+        self.missing = tuple(missing)
+
+    def to_dict(self) -> Dict:
+        return {'template': self.template, 'prompt': self.prompt, 'missing': list(self.missing)}
+
+
+class PipelineResult(_Result):
+    """Everything /api/optimize/advanced reports about one prompt and tool."""
+
+    __slots__ = ('analysis', 'basic', 'advanced', 'quality', 'suggestions', 'skipped_rules')
+
+    def __init__(self, analysis: AnalysisResult, basic: OptimizationResult, advanced: OptimizationResult,
+                 quality: QualityMetrics, suggestions: Sequence[str], skipped_rules: Sequence[Tuple[str, str]] = ()):
+        self.analysis = analysis
+        self.basic = basic
+        self.advanced = advanced
+        self.quality = quality
+        self.suggestions = tuple(suggestions)
+        self.skipped_rules = tuple(skipped_rules)
+
+    def to_dict(self) -> Dict:
+        return {
+            'analysis': self.analysis.to_dict(),
+            'basic': self.basic.to_dict(),
+            'advanced': {
+                'optimized_prompt': self.advanced.optimized_prompt,
+                'applied_optimizations': list(self.advanced.explanations),
+                'skipped_rules': [{'pattern': pattern, 'reason': reason} for pattern, reason in self.skipped_rules],
+            },
+            'quality': self.quality.to_dict(),
+            'suggestions': list(self.suggestions),
+        }
@@ -0,0 +1,158 @@
+import re
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Optional, Tuple, Union
+
+from .scanner import NeedleScanner
+
+# Below this many rules running each precompiled pattern directly is cheaper
+# than scanning for their literals first
+PREFILTER_MIN_RULES = 16
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+
+@dataclass
+class OptimizationRule:
+    """Represents a single optimization rule."""
+    pattern: str
+    replacement: str
+    condition: Optional[str] = None
+    priority: int = 1
+
+
+def required_literal(pattern: str) -> str:
+    """Return the literal text every match of ``pattern`` must start with.
+
+    Only a leading run of plain characters is taken into account, so the
+    result is empty for patterns starting with a group, class or alternation.
+    """
+    literal = []
+    for op, value in sre_parse.parse(pattern):
+        if op is not sre_parse.LITERAL:
+            break
+        literal.append(chr(value))
+    return ''.join(literal).lower()
+
+
+class CompiledRule:
+    """An OptimizationRule with its pattern compiled once."""
+
+    __slots__ = ('rule', 'regex', 'condition', 'literal', 'description')
+
+    def __init__(self, rule: OptimizationRule):
+        self.rule = rule
+        self.regex = re.compile(rule.pattern, re.IGNORECASE)
+        self.condition = rule.condition.lower() if rule.condition else None
+        literal = required_literal(rule.pattern)
+        # Case-insensitive matching of non-ASCII literals is not lowercase containment
+        self.literal = literal if literal.isascii() else ''
+        self.description = f"Applied rule: {rule.pattern} -> {rule.replacement}"
+
+
+class RuleBudget:
+    """Size and time limits for applying rules to one prompt.
+
+    Python's regex engine cannot be interrupted, so the limits are checked
+    before each rule: a rule is skipped when the text it would run on is
+    longer than ``max_input_chars``, or once ``time_limit`` seconds have
+    passed since the first check. The clock starts there rather than when
+    the budget is created, so building the optimizer or running other
+    stages first does not use up the rules' time. Skipped rules are
+    recorded in ``skipped`` as (pattern, reason) pairs. One budget can
+    span several rule sets, e.g. all stages of one request.
+    """
+
+    TOO_LARGE = 'input too large'
+    OUT_OF_TIME = 'time budget exhausted'
+
+    def __init__(self, max_input_chars: Optional[int] = None, time_limit: Optional[float] = None,
+                 clock: Callable[[], float] = time.perf_counter):
+        self.max_input_chars = max_input_chars
+        self.time_limit = time_limit
+        self._clock = clock
+        self.deadline: Optional[float] = None
+        self.skipped: List[Tuple[str, str]] = []
+
+    def check(self, text: str) -> Optional[str]:
+        """Return why a rule cannot run on ``text`` now, or None if it can."""
+        if self.max_input_chars is not None and len(text) > self.max_input_chars:
+            return self.TOO_LARGE
+        if self.time_limit is not None:
+            now = self._clock()
+            if self.deadline is None:
+                self.deadline = now + self.time_limit
+            elif now >= self.deadline:
+                return self.OUT_OF_TIME
+        return None
+
+
+class CompiledRuleSet:
+    """A tool's rules sorted by priority with patterns compiled up front.
+
+    For larger rule sets the required literal prefix of every rule is
+    collected into one NeedleScanner, so a single pass over an ASCII prompt
+    rules out every rule whose pattern cannot match. Smaller sets look for
+    each rule's literal in the lowercased prompt instead, which is much
+    cheaper than a case-insensitive regex search that finds nothing. Either
+    check is repeated only after a rule has rewritten the prompt. Non-ASCII
+    prompts skip the prefilter because case-insensitive matching there is
+    not the same as comparing lowercased text (e.g. the long s matches 's').
+    """
+
+    def __init__(self, rules: Iterable[OptimizationRule]):
+        self.rules: Tuple[CompiledRule, ...] = tuple(
+            CompiledRule(rule) for rule in sorted(rules, key=lambda r: r.priority)
+        )
+        self._literals = None
+        if len(self.rules) >= PREFILTER_MIN_RULES:
+            self._literals = NeedleScanner(rule.literal for rule in self.rules)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def apply(self, prompt: str, budget: Optional[RuleBudget] = None,
+              prompt_lower: Optional[str] = None) -> Tuple[str, List[str]]:
+        """Apply the rules in priority order, returning the result and descriptions.
+
+        With a ``budget``, rules that would exceed it are skipped and
+        recorded in ``budget.skipped`` instead of being applied. Pass
+        ``prompt_lower`` if the lowercased prompt is already at hand.
+        """
+        optimized = prompt
+        applied = []
+        if prompt_lower is None:
+            prompt_lower = prompt.lower()
+        reason = budget.check(optimized) if budget is not None else None
+        # Oversized text is not even scanned for literals
+        prefilter = reason != RuleBudget.TOO_LARGE and prompt.isascii()
+        literals = self._literals_in(optimized, prompt_lower) if prefilter else None
+
+        for rule in self.rules:
+            if rule.condition and rule.condition not in prompt_lower:
+                continue
+            if literals is not None and rule.literal and rule.literal not in literals:
+                continue
+            if budget is not None:
+                reason = budget.check(optimized)
+                if reason is not None:
+                    budget.skipped.append((rule.rule.pattern, reason))
+                    continue
+
+            optimized, count = rule.regex.subn(rule.rule.replacement, optimized)
+            if count:
+                applied.append(rule.description)
+                literals = self._literals_in(optimized) if optimized.isascii() else None
+
+        return optimized, applied
+
+    def _literals_in(self, text: str, text_lower: Optional[str] = None) -> Union[set, str]:
+        """Something ``rule.literal in`` can test: the literals found, or the lowercased text."""
+        if text_lower is None:
+            text_lower = text.lower()
+        if self._literals is None:
+            return text_lower
+        return self._literals.present(text_lower)
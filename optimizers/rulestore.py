@@ -0,0 +1,288 @@
+"""Rule files for AdvancedPromptOptimizer, compiled once and hot-reloaded.
+
+Rules and context patterns live in ``optimization_rules.json``. A RuleStore
+compiles the file into an immutable RuleBook and swaps in a new book when
+the file's mtime changes. The swap is a single attribute assignment, so
+readers never wait: a request that took the old book keeps using it, and
+the next request sees the new one. A file that fails to load or validate
+leaves the current book in place.
+
+Patterns are validated at load time. Besides having to compile, a pattern
+must not nest one unbounded quantifier inside another (as in ``(a+)+`` or
+``(.*,)*``), the classic source of catastrophic backtracking. For the same
+reason, an unbounded repeat must not contain alternatives that can match
+the same text (``(a|aa)+``), and a bounded repeat of more than a few
+iterations is held to the same rules as an unbounded one (``(a+){2,1000}``).
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Mapping, Optional, Set, Tuple
+
+from .rules import CompiledRuleSet, OptimizationRule, sre_parse
+
+RULES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'optimization_rules.json')
+
+_UNBOUNDED = sre_parse.MAXREPEAT
+_BACKTRACKING_REPEATS = (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT)
+# Python 3.11+; older versions cannot parse these constructs at all
+_ATOMIC_GROUP = getattr(sre_parse, 'ATOMIC_GROUP', None)
+_POSSESSIVE_REPEAT = getattr(sre_parse, 'POSSESSIVE_REPEAT', None)
+# Beyond this many iterations, the ways a bounded repeat can split its input
+# grow like a high power of the input length, so it is checked as unbounded
+_MAX_BOUNDED_REPEAT = 3
+# Largest character range listed one character at a time by _first_chars
+_MAX_RANGE_CHARS = 256
+
+
+def _first_chars(parsed) -> Tuple[Optional[FrozenSet[str]], bool]:
+    """Return the lowercased characters a match of ``parsed`` can start with, and whether it can be empty.
+
+    The characters are None when they cannot be listed, e.g. for ``.``,
+    ``\\w``, negated sets or lookarounds; callers treat that as "any".
+    """
+    chars: Set[str] = set()
+    for op, value in parsed:
+        if op is sre_parse.AT:
+            continue
+        if op is sre_parse.LITERAL:
+            first, empty = {chr(value).lower()}, False
+        elif op is sre_parse.IN:
+            first, empty = set(), False
+            for item_op, item in value:
+                if item_op is sre_parse.LITERAL:
+                    first.add(chr(item).lower())
+                elif item_op is sre_parse.RANGE and item[1] - item[0] < _MAX_RANGE_CHARS:
+                    first.update(chr(code).lower() for code in range(item[0], item[1] + 1))
+                else:
+                    return None, False
+        elif op is sre_parse.SUBPATTERN:
+            first, empty = _first_chars(value[-1])
+        elif op is _ATOMIC_GROUP:
+            first, empty = _first_chars(value)
+        elif op is sre_parse.BRANCH:
+            first, empty = set(), False
+            for branch in value[1]:
+                branch_first, branch_empty = _first_chars(branch)
+                if branch_first is None:
+                    return None, False
+                first |= branch_first
+                empty = empty or branch_empty
+        elif op in _BACKTRACKING_REPEATS or op is _POSSESSIVE_REPEAT:
+            first, empty = _first_chars(value[2])
+            empty = empty or value[0] == 0
+        else:
+            return None, False
+        if first is None:
+            return None, False
+        chars |= first
+        if not empty:
+            return frozenset(chars), False
+    return frozenset(chars), True
+
+
+def _overlapping_branches(branches) -> bool:
+    """Whether two of ``branches`` can start matching at the same character.
+
+    A branch that can match nothing is a prefix of every other branch, as
+    in ``(a|aa)``, which the parser turns into ``a(?:|a)``.
+    """
+    seen: Set[str] = set()
+    for branch in branches:
+        first, empty = _first_chars(branch)
+        if first is None or empty or not seen.isdisjoint(first):
+            return True
+        seen |= first
+    return False
+
+
+def _nested_unbounded_repeat(parsed, inside_unbounded: bool = False) -> bool:
+    for op, value in parsed:
+        if op in _BACKTRACKING_REPEATS:
+            low, high, body = value
+            if high == _UNBOUNDED:
+                if inside_unbounded:
+                    return True
+                if _nested_unbounded_repeat(body, True):
+                    return True
+            elif high > _MAX_BOUNDED_REPEAT:
+                if _nested_unbounded_repeat(body, True):
+                    return True
+            elif _nested_unbounded_repeat(body, inside_unbounded):
+                return True
+        elif op is sre_parse.SUBPATTERN:
+            if _nested_unbounded_repeat(value[-1], inside_unbounded):
+                return True
+        elif op is sre_parse.BRANCH:
+            # Overlapping alternatives let a repeat split the same text in many ways
+            if inside_unbounded and _overlapping_branches(value[1]):
+                return True
+            if any(_nested_unbounded_repeat(branch, inside_unbounded) for branch in value[1]):
+                return True
+        elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            if _nested_unbounded_repeat(value[1], inside_unbounded):
+                return True
+        elif op is sre_parse.GROUPREF_EXISTS:
+            if any(branch is not None and _nested_unbounded_repeat(branch, inside_unbounded)
+                   for branch in value[1:]):
+                return True
+        # An atomic group or possessive repeat only stops backtracking once its
+        # body has matched; while matching, the body backtracks like any other
+        elif op is _ATOMIC_GROUP:
+            if _nested_unbounded_repeat(value, inside_unbounded):
+                return True
+        elif op is _POSSESSIVE_REPEAT:
+            if _nested_unbounded_repeat(value[2], inside_unbounded):
+                return True
+    return False
+
+
+def validate_pattern(pattern: str, replacement: str = '') -> None:
+    """Raise ValueError if ``pattern`` is invalid or prone to catastrophic backtracking."""
+    try:
+        regex = re.compile(pattern, re.IGNORECASE)
+        sre_parse.parse_template(replacement, regex)
+    except re.error as e:
+        raise ValueError(f"Invalid rule pattern {pattern!r}: {e}") from None
+    if _nested_unbounded_repeat(sre_parse.parse(pattern)):
+        raise ValueError(f"Rule pattern {pattern!r} nests unbounded quantifiers or repeats overlapping "
+                         f"alternatives (catastrophic backtracking)")
+
+
+def _rule_from_dict(tool: str, data: Mapping) -> OptimizationRule:
+    if not isinstance(data, dict):
+        raise ValueError(f"Rule for '{tool}' must be an object")
+    pattern, replacement = data.get('pattern'), data.get('replacement')
+    condition, priority = data.get('condition'), data.get('priority', 1)
+    if not isinstance(pattern, str) or not pattern or not isinstance(replacement, str):
+        raise ValueError(f"Rule for '{tool}' needs a non-empty 'pattern' and a 'replacement' string")
+    if condition is not None and not isinstance(condition, str):
+        raise ValueError(f"Rule {pattern!r} for '{tool}': 'condition' must be a string")
+    if type(priority) is not int:
+        raise ValueError(f"Rule {pattern!r} for '{tool}': 'priority' must be an integer")
+    validate_pattern(pattern, replacement)
+    return OptimizationRule(pattern=pattern, replacement=replacement, condition=condition, priority=priority)
+
+
+class RuleBook:
+    """An immutable, fully compiled set of rules and context patterns."""
+
+    __slots__ = ('version', 'rules', 'compiled', 'context_patterns')
+
+    def __init__(self, rules: Mapping[str, Tuple[OptimizationRule, ...]],
+                 context_patterns: Mapping[str, Tuple[str, ...]], version: str = ''):
+        self.version = version
+        self.rules = MappingProxyType(dict(rules))
+        self.compiled = MappingProxyType({tool: CompiledRuleSet(tool_rules) for tool, tool_rules in rules.items()})
+        self.context_patterns = MappingProxyType(dict(context_patterns))
+
+    @classmethod
+    def from_dict(cls, data: Mapping, version: str = '') -> 'RuleBook':
+        """Validate and compile rule file contents; raises ValueError on invalid data."""
+        if not isinstance(data, dict):
+            raise ValueError("Rule file must contain an object")
+        rules, patterns = data.get('rules', {}), data.get('context_patterns', {})
+        if not isinstance(rules, dict) or not isinstance(patterns, dict):
+            raise ValueError("'rules' and 'context_patterns' must be objects")
+
+        tool_rules: Dict[str, Tuple[OptimizationRule, ...]] = {}
+        for tool, items in rules.items():
+            if not isinstance(items, list):
+                raise ValueError(f"Rules for '{tool}' must be a list")
+            tool_rules[tool] = tuple(_rule_from_dict(tool, item) for item in items)
+
+        context_patterns: Dict[str, Tuple[str, ...]] = {}
+        for context_type, enhancements in patterns.items():
+            if not isinstance(enhancements, list) or not all(isinstance(item, str) for item in enhancements):
+                raise ValueError(f"Context patterns for '{context_type}' must be a list of strings")
+            context_patterns[context_type] = tuple(enhancements)
+
+        return cls(tool_rules, context_patterns, version)
+
+    @classmethod
+    def load(cls, path: str = RULES_PATH) -> 'RuleBook':
+        """Load a JSON (or, with PyYAML installed, YAML) rule file."""
+        with open(path, 'rb') as f:
+            raw = f.read()
+        if path.endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError(f"Reading {path} requires PyYAML") from None
+            try:
+                data = yaml.safe_load(raw)
+            except yaml.YAMLError as e:
+                raise ValueError(f"Invalid YAML in {path}: {e}") from None
+        else:
+            data = json.loads(raw)
+        return cls.from_dict(data, hashlib.sha256(raw).hexdigest())
+
+
+class RuleStore:
+    """Holds the current RuleBook for a rule file and reloads it when the file changes.
+
+    The file's mtime is checked at most every ``check_interval`` seconds. A
+    reload runs in the thread that noticed the change; other threads keep
+    reading the current book meanwhile instead of waiting for it.
+    """
+
+    def __init__(self, path: str = RULES_PATH, check_interval: float = 1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.reloads = 0
+        self.last_error: Optional[str] = None
+        # The mtime is taken before reading, so a write racing the read is picked up next time
+        self._mtime = os.stat(path).st_mtime_ns
+        self._book = RuleBook.load(path)
+        self._next_check = time.monotonic() + check_interval
+        self._reload_lock = threading.Lock()
+
+    @property
+    def current(self) -> RuleBook:
+        """The current rule book; take it once per request for a consistent view."""
+        if time.monotonic() >= self._next_check:
+            self._check()
+        return self._book
+
+    def _check(self) -> None:
+        if not self._reload_lock.acquire(blocking=False):
+            return  # another thread is already checking
+        try:
+            self._next_check = time.monotonic() + self.check_interval
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError as e:
+                self.last_error = str(e)
+                return
+            if mtime != self._mtime:
+                self.reload()
+        finally:
+            self._reload_lock.release()
+
+    def reload(self) -> bool:
+        """Load the rule file now; returns False (keeping the current book) if it is invalid."""
+        try:
+            # An invalid file is not retried until it changes again
+            self._mtime = os.stat(self.path).st_mtime_ns
+            book = RuleBook.load(self.path)
+        except (OSError, ValueError) as e:
+            self.last_error = str(e)
+            return False
+        self._book = book
+        self.reloads += 1
+        self.last_error = None
+        return True
+
+    def stats(self) -> Dict:
+        book = self._book
+        return {
+            'path': self.path,
+            'version': book.version,
+            'rules': sum(len(rules) for rules in book.rules.values()),
+            'reloads': self.reloads,
+            'last_error': self.last_error,
+        }
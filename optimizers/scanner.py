@@ -0,0 +1,179 @@
+import re
+from collections import Counter
+from typing import Dict, FrozenSet, Iterable, Set
+
+from .results import AnalysisResult
+
+# Intent categories in priority order; the first category with a match wins
+INTENT_KEYWORDS = (
+    ('creation', ('create', 'build', 'implement', 'develop')),
+    ('debugging', ('fix', 'debug', 'error', 'bug')),
+    ('refactoring', ('refactor', 'improve', 'optimize', 'clean')),
+    ('testing', ('test', 'unit test', 'testing')),
+    ('explanation', ('explain', 'understand', 'how', 'what')),
+)
+
+LANGUAGES = ('python', 'javascript', 'java', 'c++', 'c#', 'go', 'rust', 'typescript', 'php', 'ruby')
+
+# Whole words counted towards complexity. The text is lowercased before
+# scanning, so the upper-case 'API' entry never matches (as before).
+TECHNICAL_TERMS = ('class', 'function', 'method', 'algorithm', 'database', 'API', 'framework', 'library')
+
+KEYWORD_TERMS = ('function', 'class', 'method', 'variable', 'algorithm', 'database',
+                 'api', 'framework', 'library', 'server', 'client', 'frontend', 'backend')
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Build a regex alternation shaped like a prefix trie of ``words``."""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            pattern = '(?:' + pattern + ')?'
+        return pattern
+
+    return build(trie)
+
+
+class NeedleScanner:
+    """Finds which of a fixed set of substrings occur in a text in one regex pass.
+
+    Matches are found with a zero-width lookahead at every position, so
+    overlapping needles are all reported, and needles that are prefixes of
+    a longer match at the same position (e.g. 'java' in 'javascript') are
+    filled in from a precomputed table. For a handful of needles repeated
+    ``in`` checks are cheaper; this pays off with hundreds of them.
+    """
+
+    def __init__(self, needles: Iterable[str]):
+        self.needles: FrozenSet[str] = frozenset(needle for needle in needles if needle)
+        self._pattern = re.compile('(?=(' + _trie_pattern(self.needles) + '))')
+        self._prefixes = {
+            needle: frozenset(other for other in self.needles if needle.startswith(other))
+            for needle in self.needles
+        }
+
+    def present(self, text: str) -> Set[str]:
+        """Return the needles that occur anywhere in ``text``."""
+        found: Set[str] = set()
+        if not self.needles:
+            return found
+        for longest in set(self._pattern.findall(text)):
+            found |= self._prefixes[longest]
+        return found
+
+    def counts(self, text: str) -> Counter:
+        """Return how often each needle occurs in ``text``, overlaps included."""
+        counts: Counter = Counter()
+        if not self.needles:
+            return counts
+        for longest, occurrences in Counter(self._pattern.findall(text)).items():
+            for needle in self._prefixes[longest]:
+                counts[needle] += occurrences
+        return counts
+
+
+class PromptText:
+    """A prompt with its lowercased text and word count, computed once.
+
+    Intent detection, rule conditions, general improvements and quality
+    metrics all work on the lowercased prompt and its whitespace-split word
+    count. A pipeline running several of them builds one PromptText and
+    passes it along instead of lowercasing and splitting the prompt again
+    for every stage.
+    """
+
+    __slots__ = ('text', 'lower', 'word_count')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.lower = text.lower()
+        self.word_count = len(text.split())
+
+    def extended(self, suffix: str) -> 'PromptText':
+        """The PromptText of ``text + suffix``.
+
+        When ``suffix`` starts with whitespace, lowercasing and splitting
+        cannot cross the boundary, so only the suffix is processed.
+        """
+        if not suffix:
+            return self
+        if not suffix[0].isspace():
+            return PromptText(self.text + suffix)
+        combined = PromptText.__new__(PromptText)
+        combined.text = self.text + suffix
+        combined.lower = self.lower + suffix.lower()
+        combined.word_count = self.word_count + len(suffix.split())
+        return combined
+
+
+class PromptScanner:
+    """Precompiled scanner producing intent, language, complexity and keywords.
+
+    The prompt is lowercased and whitespace-split once, and the whole-word
+    vocabulary (technical terms and keywords) is picked out by one compiled
+    word-bounded regex instead of tokenizing every word and checking it
+    against a list. Intent words and languages are plain substring checks on
+    the shared lowercased text, stopping at the first hit; C substring
+    search is faster here than a regex lookahead at every position.
+    """
+
+    def __init__(self):
+        vocabulary = sorted(set(TECHNICAL_TERMS) | set(KEYWORD_TERMS), key=len, reverse=True)
+        self.vocabulary = re.compile(r'\b(?:' + '|'.join(map(re.escape, vocabulary)) + r')\b')
+        self.technical_terms = frozenset(TECHNICAL_TERMS)
+        self.keyword_terms = frozenset(word for word in KEYWORD_TERMS if len(word) > 3)
+
+    def scan(self, prompt: str) -> AnalysisResult:
+        """Analyze ``prompt`` with one lowercase, one split and one regex pass."""
+        return self._analyze(prompt.lower(), len(prompt.split()))
+
+    def scan_text(self, text: PromptText) -> AnalysisResult:
+        """Analyze an already lowercased and counted prompt."""
+        return self._analyze(text.lower, text.word_count)
+
+    def _analyze(self, prompt_lower: str, word_count: int) -> AnalysisResult:
+        terms = self.vocabulary.findall(prompt_lower)
+
+        technical_count = sum(1 for term in terms if term in self.technical_terms)
+        keywords = sorted(set(term for term in terms if term in self.keyword_terms))
+
+        return AnalysisResult(
+            intent=self.intent_from(prompt_lower),
+            complexity=self.complexity_from(word_count, technical_count),
+            language=self.language_from(prompt_lower),
+            keywords=keywords,
+            length=word_count,
+        )
+
+    @staticmethod
+    def intent_from(prompt_lower: str) -> str:
+        for intent, words in INTENT_KEYWORDS:
+            if any(word in prompt_lower for word in words):
+                return intent
+        return 'general'
+
+    @staticmethod
+    def language_from(prompt_lower: str) -> str:
+        for lang in LANGUAGES:
+            if lang in prompt_lower:
+                return lang
+        return 'general'
+
+    @staticmethod
+    def complexity_from(word_count: int, technical_count: int) -> str:
+        if word_count < 10 and technical_count < 2:
+            return 'simple'
+        elif word_count < 30 and technical_count < 5:
+            return 'moderate'
+        else:
+            return 'complex'
@@ -0,0 +1,91 @@
+"""Single-flight coalescing of identical concurrent computations.
+
+When a prompt is shared across a team, many identical requests arrive
+within milliseconds of each other. ``SingleFlight.do`` runs the computation
+for the first caller of a key only; callers arriving with the same key
+while it runs wait for it and get the same result, or the same exception.
+Nothing is kept once the computation finishes, so this complements the
+result caches rather than replacing them: it also covers work that is not
+cached, and cache misses that would otherwise be computed several times
+at once.
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Flight:
+    # ``running`` is held by the computing caller until the result is in;
+    # a plain Lock is much cheaper to create than an Event
+    __slots__ = ('running', 'value', 'error')
+
+    def __init__(self):
+        self.running = threading.Lock()
+        self.running.acquire()
+        self.value: Any = None
+        self.error = None
+
+    def wait(self) -> None:
+        with self.running:
+            pass
+
+
+class SingleFlight:
+    """Thread-safe per-key deduplication of in-progress calls.
+
+    Values are shared between callers, so ``compute`` should return
+    immutable values (or values callers copy).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.computed = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def do(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return ``compute()``, sharing one call among concurrent callers of ``key``."""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                self.computed += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            flight.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = compute()
+        except BaseException as error:
+            flight.error = error
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            # Later callers start a new flight; waiters already hold this one
+            with self._lock:
+                del self._flights[key]
+            flight.running.release()
+        return flight.value
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the computed/coalesced counters and the number of calls in progress."""
+        with self._lock:
+            calls = self.computed + self.coalesced
+            return {
+                'in_flight': len(self._flights),
+                'computed': self.computed,
+                'coalesced': self.coalesced,
+                'errors': self.errors,
+                'coalesce_rate': self.coalesced / calls if calls else 0.0,
+            }
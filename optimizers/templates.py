@@ -0,0 +1,140 @@
+"""Prompt generation from the prompt patterns in tool_analysis.json.
+
+Each tool profile defines prompt patterns (``function_creation``,
+``debugging``, ...) with slots such as ``{language}`` or ``{name}``. The
+TemplateEngine chooses a tool's pattern from the detected intent of a
+prompt. It fills the slots with entities extracted from the prompt, and
+slots it cannot fill keep their ``{placeholder}`` for the user to complete.
+The pattern for every (tool, intent) pair is resolved when the engine is
+built, so a request only does a dict lookup, runs the extractors for that
+pattern's slots and joins the pattern's parsed segments.
+
+The extractors run on user input of up to MAX_PROMPT_CHARS, so every
+regex here must stay linear in the prompt length.
+"""
+import re
+from typing import Callable, Dict, Iterable, Mapping, Optional, Pattern
+
+from .registry import PromptPattern, ToolRegistry
+from .results import AnalysisResult, TemplateResult
+
+# Pattern names to use for each intent, in order of preference
+INTENT_PATTERNS = {
+    'creation': ('function_creation', 'prototyping', 'aws_integration', 'consistency'),
+    'debugging': ('debugging', 'editing'),
+    'refactoring': ('refactoring', 'optimization'),
+    'testing': ('testing',),
+    'explanation': ('learning',),
+    'general': ('code_completion', 'editing', 'extension', 'enterprise', 'quality'),
+}
+
+# Backticks are kept out of the info string so a run of them fails at once
+_CODE_BLOCK = re.compile(r'```[^\n`]*\n(.*?)```', re.DOTALL)
+_PATH = re.compile(r'[\w./-]+')
+_SOURCE_EXTENSIONS = frozenset(('py', 'js', 'jsx', 'ts', 'tsx', 'java', 'go', 'rs', 'rb', 'php', 'cs', 'cpp',
+                                'c', 'h', 'kt', 'swift'))
+MAX_FILENAME_CHARS = 256
+_LINE_NUMBER = re.compile(r'\bline (\d+)', re.IGNORECASE)
+_NAME = re.compile(r'\b(?:named|called) `?(\w+)|`(\w+)(?:\(\))?`|\b(\w+)\(\)')
+_ERROR_TYPE = re.compile(r'\b([A-Z]\w*(?:Error|Exception))\b')
+_ERROR_MESSAGE = re.compile(r'\berror: *([^\n]+)', re.IGNORECASE)
+_DESCRIPTION = re.compile(r'\b(?:that|which) ([^.\n]+)', re.IGNORECASE)
+_CONCEPT = re.compile(r'\bhow (?:to|do I) ([^.?\n]+)', re.IGNORECASE)
+
+
+def _first_group(regex: Pattern) -> Callable[[str, AnalysisResult], Optional[str]]:
+    def extract(prompt: str, analysis: AnalysisResult) -> Optional[str]:
+        match = regex.search(prompt)
+        return match.group(1).strip() if match else None
+    return extract
+
+
+def _language(prompt: str, analysis: AnalysisResult) -> Optional[str]:
+    return analysis.language if analysis.language != 'general' else None
+
+
+def _filename(prompt: str, analysis: AnalysisResult) -> Optional[str]:
+    # One pass over path-like tokens; a backtracking regex is quadratic on e.g. 'a.a.a.a...'
+    for match in _PATH.finditer(prompt):
+        path = match.group(0).rstrip('./-')
+        stem, _, extension = path.rpartition('.')
+        if stem and extension in _SOURCE_EXTENSIONS and len(path) <= MAX_FILENAME_CHARS:
+            return path
+    return None
+
+
+def _location(prompt: str, analysis: AnalysisResult) -> Optional[str]:
+    match = _LINE_NUMBER.search(prompt)
+    return match.group(0) if match else None
+
+
+def _name(prompt: str, analysis: AnalysisResult) -> Optional[str]:
+    match = _NAME.search(prompt)
+    return next(group for group in match.groups() if group) if match else None
+
+
+def _concept(prompt: str, analysis: AnalysisResult) -> Optional[str]:
+    match = _CONCEPT.search(prompt)
+    if not match:
+        return None
+    concept = match.group(1).strip()
+    # 'how to X in python' fills '... how to {concept} in {language}' without repeating the language
+    suffix = f" in {analysis.language}"
+    return concept[:-len(suffix)] if concept.lower().endswith(suffix) else concept
+
+
+# Entity extractors and the slot names each one fills
+EXTRACTORS = (
+    (('language',), _language),
+    (('code', 'code_snippet'), _first_group(_CODE_BLOCK)),
+    (('filename', 'file', 'reference_file'), _filename),
+    (('line_number',), _first_group(_LINE_NUMBER)),
+    (('location',), _location),
+    (('name',), _name),
+    (('error_type',), _first_group(_ERROR_TYPE)),
+    (('error_message', 'error'), _first_group(_ERROR_MESSAGE)),
+    (('description', 'functionality'), _first_group(_DESCRIPTION)),
+    (('concept',), _concept),
+)
+
+
+def extract_entities(prompt: str, analysis: AnalysisResult,
+                     fields: Optional[Iterable[str]] = None) -> Dict[str, str]:
+    """Slot values found in ``prompt``, keyed by every slot name they fill.
+
+    With ``fields``, only the extractors for those slots run.
+    """
+    wanted = None if fields is None else frozenset(fields)
+    entities = {}
+    for names, extract in EXTRACTORS:
+        if wanted is None or not wanted.isdisjoint(names):
+            value = extract(prompt, analysis)
+            if value:
+                entities.update(dict.fromkeys(names, value))
+    return entities
+
+
+class TemplateEngine:
+    """Renders prompts from tool prompt patterns, chosen by intent."""
+
+    def __init__(self, registry: ToolRegistry, intent_patterns: Mapping = INTENT_PATTERNS):
+        self._patterns: Dict[str, Dict[str, PromptPattern]] = {}
+        for tool_id in registry:
+            patterns = registry[tool_id].prompt_patterns
+            selected = self._patterns[tool_id] = {}
+            for intent, names in intent_patterns.items():
+                name = next((name for name in names if name in patterns), None)
+                if name is not None:
+                    selected[intent] = patterns[name]
+
+    def pattern(self, tool_id: str, intent: str) -> Optional[PromptPattern]:
+        """The pattern used for ``intent`` prompts to ``tool_id``, if it has one."""
+        return self._patterns.get(tool_id, {}).get(intent)
+
+    def render(self, prompt: str, tool_id: str, analysis: AnalysisResult) -> Optional[TemplateResult]:
+        """Fill the tool's pattern for the prompt's intent; None if there is none."""
+        pattern = self.pattern(tool_id, analysis.intent)
+        if pattern is None:
+            return None
+        entities = extract_entities(prompt, analysis, pattern.fields)
+        return TemplateResult(pattern.name, pattern.render(entities), pattern.missing(entities))
@@ -0,0 +1,67 @@
+"""Frozen copy of the prompt analysis PromptScanner replaced.
+
+These are PromptOptimizer's ``_detect_intent``, ``_assess_complexity``,
+``_detect_language`` and ``_extract_keywords`` as they were before the
+scanner rewrite, kept verbatim (quirks included: ``API`` never matches the
+lowercased prompt) as the reference the scanner must agree with. Do not
+change them along with the scanner.
+"""
+import re
+from typing import Dict, List
+
+
+def detect_intent(prompt: str) -> str:
+    prompt_lower = prompt.lower()
+
+    if any(word in prompt_lower for word in ['create', 'build', 'implement', 'develop']):
+        return 'creation'
+    elif any(word in prompt_lower for word in ['fix', 'debug', 'error', 'bug']):
+        return 'debugging'
+    elif any(word in prompt_lower for word in ['refactor', 'improve', 'optimize', 'clean']):
+        return 'refactoring'
+    elif any(word in prompt_lower for word in ['test', 'unit test', 'testing']):
+        return 'testing'
+    elif any(word in prompt_lower for word in ['explain', 'understand', 'how', 'what']):
+        return 'explanation'
+    else:
+        return 'general'
+
+
+def assess_complexity(prompt: str) -> str:
+    word_count = len(prompt.split())
+    technical_terms = len(re.findall(r'\b(?:class|function|method|algorithm|database|API|framework|library)\b', prompt.lower()))
+
+    if word_count < 10 and technical_terms < 2:
+        return 'simple'
+    elif word_count < 30 and technical_terms < 5:
+        return 'moderate'
+    else:
+        return 'complex'
+
+
+def detect_language(prompt: str) -> str:
+    languages = ['python', 'javascript', 'java', 'c++', 'c#', 'go', 'rust', 'typescript', 'php', 'ruby']
+    prompt_lower = prompt.lower()
+
+    for lang in languages:
+        if lang in prompt_lower:
+            return lang
+    return 'general'
+
+
+def extract_keywords(prompt: str) -> List[str]:
+    words = re.findall(r'\b\w+\b', prompt.lower())
+    technical_keywords = [word for word in words if len(word) > 3 and
+                          word in ['function', 'class', 'method', 'variable', 'algorithm', 'database',
+                                   'api', 'framework', 'library', 'server', 'client', 'frontend', 'backend']]
+    return list(set(technical_keywords))
+
+
+def analyze_prompt(prompt: str) -> Dict:
+    return {
+        'intent': detect_intent(prompt),
+        'complexity': assess_complexity(prompt),
+        'language': detect_language(prompt),
+        'keywords': extract_keywords(prompt),
+        'length': len(prompt.split())
+    }
@@ -0,0 +1,13 @@
+"""The advanced optimizer's demo entry point."""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_demo_runs_as_module():
+    output = subprocess.run([sys.executable, '-m', 'optimizers.advanced_optimizer'], cwd=ROOT, check=True,
+                            stdout=subprocess.PIPE, universal_newlines=True).stdout
+    assert output.startswith('Original: create a function that validates emails')
+    assert 'Suggestions: ' in output
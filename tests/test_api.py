@@ -0,0 +1,31 @@
+"""Request validation of the JSON endpoints."""
+import json
+
+import pytest
+
+import app
+
+JSON_OBJECT_ENDPOINTS = ['/api/optimize/batch', '/api/optimize/advanced', '/api/template',
+                         '/api/analyze/sessions', '/api/analyze/sessions/abc/edits']
+
+
+@pytest.fixture
+def client():
+    return app.app.test_client()
+
+
+@pytest.mark.parametrize('endpoint', JSON_OBJECT_ENDPOINTS)
+@pytest.mark.parametrize('body', [0, 1, [], [1], False, True, '', 'text', None])
+def test_body_must_be_json_object(client, endpoint, body):
+    response = client.post(endpoint, data=json.dumps(body), content_type='application/json')
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Request body must be a JSON object'}
+
+
+def test_session_analysis_matches_full_analysis(client):
+    created = client.post('/api/analyze/sessions', json={'prompt': 'Create a server'}).get_json()
+    edits = [{'offset': 15, 'delete': 0, 'insert': ' and a client with a database class'}]
+    edited = client.post(f"/api/analyze/sessions/{created['session_id']}/edits", json={'edits': edits}).get_json()
+    prompt = 'Create a server and a client with a database class'
+    assert edited['analysis'] == app.get_optimizer().analyze_prompt(prompt).to_dict()
+    assert edited['analysis']['keywords'] == ['class', 'client', 'database', 'server']
@@ -0,0 +1,64 @@
+"""The NDJSON CLI: input validation, output order and streaming."""
+import io
+import json
+
+import pytest
+
+from optimizers.cli import main, optimize_records, read_records
+
+ERROR_LINES = 20000
+
+
+def invalid_records(consumed):
+    for line in range(1, ERROR_LINES + 1):
+        consumed.append(line)
+        yield {'line': line, 'error': 'Missing prompt'}
+
+
+@pytest.mark.parametrize('workers, chunksize', [(1, 64), (2, 16)])
+def test_error_records_are_streamed(workers, chunksize):
+    consumed = []
+    results = optimize_records(invalid_records(consumed), ['copilot'], workers=workers, chunksize=chunksize)
+    # Errors come out in order while the input is still being read; at most
+    # run_tasks' in-flight chunks are read ahead of the output
+    read_ahead = 2 * workers * chunksize + 1
+    for line, result in enumerate(results, 1):
+        assert result == {'line': line, 'error': 'Missing prompt'}
+        assert len(consumed) <= line + read_ahead
+    assert line == ERROR_LINES
+
+
+@pytest.mark.parametrize('engine', ['basic', 'advanced'])
+def test_results_keep_input_order(engine):
+    lines = ['"Write code for a parser"', 'not json', '{"id": 7, "prompt": "Fix the bug in my server"}',
+             '', '{"tools": ["cursor"]}', '{"prompt": "Explain this", "tools": "cursor"}', '"Implement a cache"']
+    results = list(optimize_records(read_records(io.StringIO('\n'.join(lines))), ['copilot', 'cursor'], engine))
+    assert [(result['line'], result.get('tool')) for result in results] == [
+        (1, 'copilot'), (1, 'cursor'), (2, None), (3, 'copilot'), (3, 'cursor'),
+        (5, None), (6, None), (7, 'copilot'), (7, 'cursor'),
+    ]
+    assert results[3]['id'] == 7
+    assert results[2]['error'].startswith('Invalid JSON')
+    assert results[5]['error'] == 'Missing prompt'
+    assert results[6]['error'] == 'tools must be a list of tool ids'
+
+
+@pytest.mark.parametrize('engine', ['basic', 'advanced'])
+@pytest.mark.parametrize('workers', [1, 2])
+def test_unknown_tool(engine, workers):
+    records = read_records(io.StringIO('"Create a function"\n{"prompt": "Fix it", "tools": ["nope", "cursor"]}\n'))
+    results = list(optimize_records(records, ['copilot', 'unknown'], engine, workers=workers))
+    assert [(result['line'], result['tool'], result.get('error')) for result in results] == [
+        (1, 'copilot', None), (1, 'unknown', 'Tool not found'), (2, 'nope', 'Tool not found'), (2, 'cursor', None),
+    ]
+    assert 'optimized_prompt' in results[0] and 'optimized_prompt' in results[3]
+
+
+@pytest.mark.parametrize('engine', ['basic', 'advanced'])
+def test_main_unknown_tool(engine, tmp_path, capsys):
+    path = tmp_path / 'prompts.jsonl'
+    path.write_text('"Create a function"\n', encoding='utf-8')
+    assert main([str(path), '--engine', engine, '--tools', 'copilot,nope']) == 0
+    results = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert results[1] == {'line': 1, 'tool': 'nope', 'error': 'Tool not found'}
+    assert results[0]['tool'] == 'copilot' and 'error' not in results[0]
@@ -0,0 +1,36 @@
+"""Importing app.py and serving the first request must stay within the cold-start budget."""
+import statistics
+
+import pytest
+
+from benchmarks.bench_startup import COLD_START_BUDGET_MS, ENDPOINTS, run_probe
+
+RUNS = 3
+
+
+@pytest.mark.parametrize('endpoint', ENDPOINTS)
+def test_cold_start_within_budget(endpoint):
+    # Each probe is a fresh interpreter; the median smooths out a slow run
+    runs = [run_probe(endpoint) for _ in range(RUNS)]
+    cold_start_ms = statistics.median(run['import'] + run['first_request'] for run in runs) * 1000
+    assert cold_start_ms <= COLD_START_BUDGET_MS, (
+        f"cold start {cold_start_ms:.1f} ms for {endpoint} is over the {COLD_START_BUDGET_MS} ms budget; "
+        f"run python -m benchmarks.bench_startup --endpoint {endpoint} for a breakdown"
+    )
+
+
+def test_import_does_not_build_services():
+    run = run_probe()
+    # Only what the first /api/optimize request needs is built
+    assert 'get_optimizer' in run['initializers']
+    assert 'get_advanced_optimizer' not in run['initializers']
+    assert 'get_template_engine' not in run['initializers']
+
+
+def test_first_advanced_request_runs_every_rule():
+    # Building the advanced optimizer on the first request must not eat into the rule time budget
+    run = run_probe('/api/optimize/advanced')
+    assert 'get_advanced_optimizer' in run['initializers']
+    advanced = run['first_response']['advanced']
+    assert advanced['skipped_rules'] == []
+    assert any(applied.startswith('Applied rule: implement (.+)') for applied in advanced['applied_optimizations'])
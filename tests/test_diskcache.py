@@ -0,0 +1,55 @@
+"""Opening the shared SQLite cache when other processes hold it locked."""
+import sqlite3
+import time
+
+import pytest
+
+import app
+from optimizers.cache import LRUCache
+from optimizers.diskcache import DiskCache
+from optimizers.results import OptimizationResult
+
+
+def locked_create(monkeypatch, failures):
+    """Make DiskCache._create fail with 'database is locked' ``failures`` times."""
+    calls = []
+    create = DiskCache._create
+
+    def flaky(self):
+        calls.append(time.monotonic())
+        if len(calls) <= failures:
+            raise sqlite3.OperationalError('database is locked')
+        create(self)
+
+    monkeypatch.setattr(DiskCache, '_create', flaky)
+    return calls
+
+
+def test_retries_locked_file(monkeypatch, tmp_path):
+    calls = locked_create(monkeypatch, failures=3)
+    cache = DiskCache(str(tmp_path / 'cache.db'))
+    assert len(calls) == 4
+    cache.set('key', OptimizationResult('prompt', ['explanation']))
+    assert cache.get('key') == ('prompt', ('explanation',))
+
+
+def test_gives_up_after_timeout(monkeypatch, tmp_path):
+    calls = locked_create(monkeypatch, failures=1000)
+    start = time.monotonic()
+    with pytest.raises(sqlite3.OperationalError, match='locked'):
+        DiskCache(str(tmp_path / 'cache.db'), timeout=0.2)
+    assert 1 < len(calls) < 1000
+    assert time.monotonic() - start < 1
+
+
+def test_other_errors_are_not_retried(tmp_path):
+    with pytest.raises(sqlite3.OperationalError):
+        DiskCache(str(tmp_path))  # a directory
+
+
+def test_app_falls_back_to_memory_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(app, 'DISK_CACHE_PATH', str(tmp_path))
+    optimizer = app.get_optimizer.__wrapped__()
+    assert isinstance(optimizer.cache, LRUCache)
+    result = optimizer.optimize_for_tool('Create a python function', 'copilot')
+    assert optimizer.optimize_for_tool('Create a python function', 'copilot') == result
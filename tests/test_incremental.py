@@ -0,0 +1,40 @@
+"""Incremental analysis must always equal a full analysis of the edited text."""
+import random
+
+import pytest
+
+from optimizers.incremental import IncrementalAnalysis
+from optimizers.prompt_optimizer import PromptOptimizer
+
+from .test_scanner_equivalence import random_prompts
+
+SNIPPETS = ['', ' ', '\n', 'a', 'api', 'API ', 'class', ' function ', 'Function', 'server', 'client ',
+            'backend', 'frontend-', 'database', 'framework', 'library', 'variable_', 'method.', 'algorithm',
+            'python', 'java', 'script', 'c++', 'c#', 'go', 'rust', 'fix', 'create', 'test', 'how', 'ſ', 'İ']
+
+
+def random_edit(rng, text):
+    offset = rng.randint(0, len(text))
+    delete = rng.randint(0, min(8, len(text) - offset))
+    insert = ''.join(rng.choice(SNIPPETS) for _ in range(rng.randint(0, 3)))
+    return offset, delete, insert
+
+
+@pytest.fixture(scope='module')
+def optimizer():
+    return PromptOptimizer()
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_random_edits(optimizer, seed):
+    rng = random.Random(seed)
+    for prompt in random_prompts(30, seed):
+        incremental = IncrementalAnalysis(optimizer.scanner, prompt)
+        text = prompt
+        for _ in range(100):
+            offset, delete, insert = random_edit(rng, text)
+            incremental.apply_edit(offset, delete, insert)
+            text = text[:offset] + insert + text[offset + delete:]
+            assert incremental.text == text
+            # Exact equality, keyword order included
+            assert incremental.analysis().to_dict() == optimizer.analyze_prompt(text).to_dict(), text
@@ -0,0 +1,39 @@
+"""RuleBudget limits and their effect on CompiledRuleSet.apply."""
+from optimizers.rules import CompiledRuleSet, OptimizationRule, RuleBudget
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_time_limit_starts_at_first_check():
+    clock = FakeClock()
+    budget = RuleBudget(time_limit=0.05, clock=clock)
+    clock.now += 10  # e.g. building the optimizer before the rules run
+    assert budget.check('text') is None
+    clock.now += 0.04
+    assert budget.check('text') is None
+    clock.now += 0.02
+    assert budget.check('text') == RuleBudget.OUT_OF_TIME
+
+
+def test_input_size_limit():
+    budget = RuleBudget(max_input_chars=4)
+    assert budget.check('four') is None
+    assert budget.check('fives') == RuleBudget.TOO_LARGE
+
+
+def test_apply_records_skipped_rules():
+    rules = CompiledRuleSet([
+        OptimizationRule(pattern=r'implement (.+)', replacement=r'implement \1 with error handling'),
+        OptimizationRule(pattern=r'write code', replacement='write clean code', priority=2),
+    ])
+    budget = RuleBudget(max_input_chars=10)
+    optimized, applied = rules.apply('implement a parser and write code', budget)
+    assert optimized == 'implement a parser and write code'
+    assert applied == []
+    assert budget.skipped == [('implement (.+)', RuleBudget.TOO_LARGE), ('write code', RuleBudget.TOO_LARGE)]
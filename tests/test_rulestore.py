@@ -0,0 +1,50 @@
+"""Rule pattern validation at load time."""
+import sys
+
+import pytest
+
+from optimizers.rulestore import RuleBook, validate_pattern
+
+CATASTROPHIC = [
+    # Nested unbounded quantifiers
+    '(a+)+', '(a*)*b', '(.*,)*', '(?:x(?:a+)?)*', '(?:\\w+ )*',
+    # Alternatives that can match the same text under an unbounded repeat
+    '(a|aa)+$', '(a|ab)*', '(a|a)+', '(ab|a)+c', '(?:x|xy)*z', '(aa|ab|b)+', '(?:foo|fo)+', '(?:a|)+',
+    '(?:A|ab)+', '(?:[a-c]x|bz)+', '(\\w|foo)+',
+    # Large bounded repeats of unbounded or ambiguous bodies
+    '(a+){2,1000}', '(a+){2,10}', '(.*){4}', '(a|aa){2,100}',
+]
+if sys.version_info >= (3, 11):
+    CATASTROPHIC += ['(?>a+)+', '(?>a|aa)+']
+
+SAFE = [
+    'implement (.+)', 'fix (.+) in (.+)', 'create a function', '(?:please )?(fix|find) (.+)',
+    '(foo|bar)+', '(ab|cd)+', '(ab|ac)+', '(a|b|c)+', '(?:ab|ba)*', '(x(?:a|b)y)+',
+    '(a+){2,3}', '(\\w{1,50} )*', '(?:[a-c]x|dz)+', '(?:a|aa)', '(?:a|b?c)+',
+]
+if sys.version_info >= (3, 11):
+    # A possessive repeat never gives back what it matched
+    SAFE += ['(a++)+']
+
+
+@pytest.mark.parametrize('pattern', CATASTROPHIC)
+def test_rejects_catastrophic_patterns(pattern):
+    with pytest.raises(ValueError, match='catastrophic backtracking'):
+        validate_pattern(pattern)
+
+
+@pytest.mark.parametrize('pattern', SAFE)
+def test_accepts_safe_patterns(pattern):
+    validate_pattern(pattern)
+
+
+def test_rejects_invalid_patterns():
+    with pytest.raises(ValueError, match='Invalid rule pattern'):
+        validate_pattern('(unclosed')
+    with pytest.raises(ValueError, match='Invalid rule pattern'):
+        validate_pattern('fix (.+)', r'fixed \2')
+
+
+def test_shipped_rules_are_valid():
+    book = RuleBook.load()
+    assert book.rules
@@ -0,0 +1,95 @@
+"""PromptScanner must analyze every prompt exactly like the code it replaced."""
+import random
+
+import pytest
+
+from benchmarks.corpus import make_corpus, mixed_prompts
+from optimizers.prompt_optimizer import PromptOptimizer
+from optimizers.scanner import PromptScanner, PromptText
+
+from . import legacy_analysis
+
+FIXED_PROMPTS = [
+    '',
+    '   ',
+    'Create a python function that validates email addresses',
+    'Fix the bug in my JavaScript server',
+    'Refactor this Java class to improve readability',
+    'Write unit tests for the parser',
+    'Explain how the algorithm works',
+    'hello there',
+    # Substring semantics: intents and languages match inside other words
+    'prefix the goal: a rusty typescripted gopher',
+    'what about c++ and c# and golang?',
+    'debugger builds testing whatever',
+    # Keywords need word boundaries and more than three characters
+    'api API Api apis class classes function_name functions',
+    'Database, DATABASE; database. frontend-backend client/server',
+    # The old complexity regex lowercases the prompt, so API never counts
+    'API API API API API API class function method algorithm database framework library',
+    ' '.join(['class function'] * 20),
+    'word ' * 9 + 'class',
+    'word ' * 29,
+    'word ' * 30,
+    # Unicode case mapping and separators
+    'ΑΣ İstanbul ſerver Kelvin K FUNCTİON',
+    'python\tjava\nrust\r\ngo ruby php',
+    'create' * 500,
+    'ÇLASS ﬁx ß ẞ',
+]
+
+WORDS = ('create build implement develop fix debug error bug refactor improve optimize clean test '
+         'unit testing explain understand how what python javascript java c++ c# go rust typescript '
+         'php ruby class function method algorithm database API api framework library server client '
+         'frontend backend variable write code a the that with ΑΣ İ K ſ functions classes Create FIX').split()
+SEPARATORS = [' ', '  ', '\n', '.', '. ', '\t', '', '-', '_', ', ', '(', ')']
+
+
+def random_prompts(count, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield ''.join(rng.choice(WORDS) + rng.choice(SEPARATORS) for _ in range(rng.randint(0, 60)))
+
+
+def corpus_prompts():
+    corpus = make_corpus(40)
+    return mixed_prompts(200) + [prompt for prompts in corpus.values() for prompt in prompts]
+
+
+def assert_equivalent(scanner, prompt):
+    expected = legacy_analysis.analyze_prompt(prompt)
+    expected['keywords'] = sorted(expected['keywords'])
+    for analysis in (scanner.scan(prompt), scanner.scan_text(PromptText(prompt))):
+        actual = analysis.to_dict()
+        actual['keywords'] = sorted(actual['keywords'])
+        assert actual == expected, prompt
+
+
+@pytest.fixture(scope='module')
+def scanner():
+    return PromptScanner()
+
+
+@pytest.mark.parametrize('prompt', FIXED_PROMPTS)
+def test_fixed_prompts(scanner, prompt):
+    assert_equivalent(scanner, prompt)
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_random_prompts(scanner, seed):
+    for prompt in random_prompts(2000, seed):
+        assert_equivalent(scanner, prompt)
+
+
+def test_benchmark_corpus(scanner):
+    for prompt in corpus_prompts():
+        assert_equivalent(scanner, prompt)
+
+
+def test_optimizer_detection_methods():
+    optimizer = PromptOptimizer()
+    for prompt in FIXED_PROMPTS + list(random_prompts(500, seed=99)):
+        assert optimizer._detect_intent(prompt) == legacy_analysis.detect_intent(prompt)
+        assert optimizer._assess_complexity(prompt) == legacy_analysis.assess_complexity(prompt)
+        assert optimizer._detect_language(prompt) == legacy_analysis.detect_language(prompt)
+        assert sorted(optimizer._extract_keywords(prompt)) == sorted(legacy_analysis.extract_keywords(prompt))